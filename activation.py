@@ -0,0 +1,95 @@
+import pygame
+from config import *
+from spatial import SpatialHash
+
+class EnemyActivation:
+    """
+    Enemies sleep in the room they belong to and cost nothing per frame
+    until the player gets within ENEMY_WAKE_MARGIN tiles of that room (its
+    doorways and the corridor outside). Awake enemies that end up far from
+    the player are put back to sleep in the room they are in, checked only
+    every ENEMY_SLEEP_CHECK_INTERVAL frames.
+
+    Sleeping enemies don't move, so they are kept in sleeping_hash, which
+    only changes when enemies fall asleep or wake up. Per-frame hashing
+    only covers the active ones.
+    """
+    def __init__(self, rooms, tile_size=TILE_SIZE, stats=None):
+        self.rooms = rooms
+        self.tile_size = tile_size
+        margin = ENEMY_WAKE_MARGIN * 2
+        self.zones = [room.rect.inflate(margin, margin) for room in rooms]
+        self.sleeping = {room: pygame.sprite.Group() for room in rooms}
+        self.active = pygame.sprite.Group()
+        self.sleeping_hash = SpatialHash(COLLISION_CELL_SIZE, stats)
+        self.player_tile = None
+        self.player_rooms = []
+        self.frame = 0
+
+    def add(self, enemy):
+        # Killed enemies drop out of these groups on their own. Enemies with
+        # no room, or one this level doesn't know, start awake.
+        bucket = self.sleeping.get(enemy.room)
+        if bucket is None:
+            self.active.add(enemy)
+        else:
+            bucket.add(enemy)
+            self.sleeping_hash.insert(enemy)
+
+    def wake(self, enemy):
+        bucket = self.sleeping.get(enemy.room)
+        if bucket is not None and enemy in bucket:
+            bucket.remove(enemy)
+            self.sleeping_hash.remove(enemy)
+        self.active.add(enemy)
+
+    def update(self, player):
+        self.frame += 1
+        ts = self.tile_size
+        tile = (player.rect.centerx // ts, player.rect.centery // ts)
+        if tile != self.player_tile:
+            self.player_tile = tile
+            self.player_rooms = [room for room, zone in zip(self.rooms, self.zones) if zone.collidepoint(tile)]
+
+        for room in self.player_rooms:
+            bucket = self.sleeping[room]
+            if bucket:
+                for enemy in bucket:
+                    self.sleeping_hash.remove(enemy)
+                self.active.add(bucket)
+                bucket.empty()
+
+        if self.frame % ENEMY_SLEEP_CHECK_INTERVAL == 0:
+            self.sleep_far(player)
+
+    def sleep_far(self, player):
+        if not self.rooms:
+            return
+        px, py = player.rect.center
+        limit = ENEMY_SLEEP_DISTANCE * ENEMY_SLEEP_DISTANCE
+        for enemy in self.active.sprites():
+            ex, ey = enemy.rect.center
+            if (ex - px) ** 2 + (ey - py) ** 2 <= limit:
+                continue
+            room = self.room_for(enemy)
+            if room in self.player_rooms:
+                continue
+            enemy.room = room
+            self.active.remove(enemy)
+            self.sleeping[room].add(enemy)
+            self.sleeping_hash.insert(enemy)
+
+    def room_for(self, enemy):
+        # Room the enemy stands in, or the one with the closest center when
+        # it is out in a corridor
+        ts = self.tile_size
+        tile = (enemy.rect.centerx // ts, enemy.rect.centery // ts)
+        for room in self.rooms:
+            if room.rect.collidepoint(tile):
+                return room
+        tx, ty = tile
+        return min(self.rooms, key=lambda room: (room.center[0] - tx) ** 2 + (room.center[1] - ty) ** 2)
+
+    def counts(self):
+        sleeping = sum(len(bucket) for bucket in self.sleeping.values())
+        return {"active": len(self.active), "sleeping": sleeping}
@@ -1,12 +1,30 @@
 import pygame
 from config import *
 
+# Darker variants for stronger enemies, indexed by color tier
+ENEMY_TIER_COLORS = {
+    ENEMY_MELEE: [MELEE_COLOR, (180, 0, 0), (120, 0, 0)],
+    ENEMY_RANGED: [RANGED_COLOR, (0, 180, 0), (0, 120, 0)],
+    ENEMY_DASHER: [DASHER_COLOR],
+    ENEMY_BOMBER: [BOMBER_COLOR],
+}
+
 class SpriteFactory:
+    # Every sprite variant is rasterized once into a shared atlas and handed
+    # out as subsurfaces; see get_* below.
+    _atlas = None
+    _atlas_converted = False
+    _sprites = {}
+
     @staticmethod
     def create_player_sprite():
         # Create a surface with transparency
         surface = pygame.Surface((PLAYER_SIZE, PLAYER_SIZE), pygame.SRCALPHA)
-        
+        SpriteFactory.draw_player(surface)
+        return surface
+
+    @staticmethod
+    def draw_player(surface):
         # Body (Circle)
         center = (PLAYER_SIZE // 2, PLAYER_SIZE // 2)
         radius = PLAYER_SIZE // 2
@@ -27,20 +45,27 @@ class SpriteFactory:
         # Look slightly forward/down
         pygame.draw.circle(surface, BLACK, (left_eye_pos[0], left_eye_pos[1] + 1), pupil_radius)
         pygame.draw.circle(surface, BLACK, (right_eye_pos[0], right_eye_pos[1] + 1), pupil_radius)
-        
-        return surface
+
+    @staticmethod
+    def color_tier(enemy_type, hp_multiplier):
+        # Darken if stronger
+        tier = 0
+        if hp_multiplier > 1.2: tier = 1
+        if hp_multiplier > 1.5: tier = 2
+        return min(tier, len(ENEMY_TIER_COLORS[enemy_type]) - 1)
 
     @staticmethod
     def create_enemy_sprite(enemy_type, hp_multiplier=1.0):
         surface = pygame.Surface((ENEMY_SIZE, ENEMY_SIZE), pygame.SRCALPHA)
-        
+        tier = SpriteFactory.color_tier(enemy_type, hp_multiplier)
+        SpriteFactory.draw_enemy(surface, enemy_type, tier)
+        return surface
+
+    @staticmethod
+    def draw_enemy(surface, enemy_type, tier=0):
         # Color based on type
+        color = ENEMY_TIER_COLORS[enemy_type][tier]
         if enemy_type == ENEMY_MELEE:
-            color = MELEE_COLOR
-            # Darken if stronger
-            if hp_multiplier > 1.2: color = (180, 0, 0)
-            if hp_multiplier > 1.5: color = (120, 0, 0)
-            
             # Body (Rounded Rect)
             rect = pygame.Rect(0, 0, ENEMY_SIZE, ENEMY_SIZE)
             pygame.draw.rect(surface, color, rect, border_radius=5)
@@ -53,11 +78,6 @@ class SpriteFactory:
             pygame.draw.line(surface, BLACK, (10, 24), (22, 24), 2)
             
         elif enemy_type == ENEMY_RANGED:
-            color = RANGED_COLOR
-            # Darken if stronger
-            if hp_multiplier > 1.2: color = (0, 180, 0)
-            if hp_multiplier > 1.5: color = (0, 120, 0)
-
             # Body (Triangle / Robe-like)
             points = [(ENEMY_SIZE//2, 2), (2, ENEMY_SIZE-2), (ENEMY_SIZE-2, ENEMY_SIZE-2)]
             pygame.draw.polygon(surface, color, points)
@@ -68,7 +88,6 @@ class SpriteFactory:
             pygame.draw.circle(surface, WHITE, (ENEMY_SIZE//2, ENEMY_SIZE//2 - 2), 2)
         
         elif enemy_type == ENEMY_DASHER:
-            color = DASHER_COLOR
             # Lightning Bolt Shape or similar
             # For simplicity, a sleek diamond
             points = [(ENEMY_SIZE//2, 0), (ENEMY_SIZE, ENEMY_SIZE//2), (ENEMY_SIZE//2, ENEMY_SIZE), (0, ENEMY_SIZE//2)]
@@ -78,19 +97,21 @@ class SpriteFactory:
             pygame.draw.line(surface, WHITE, (5, ENEMY_SIZE//2), (ENEMY_SIZE-5, ENEMY_SIZE//2), 2)
 
         elif enemy_type == ENEMY_BOMBER:
-            color = BOMBER_COLOR
             # Bomb shape (Circle)
             pygame.draw.circle(surface, color, (ENEMY_SIZE//2, ENEMY_SIZE//2), ENEMY_SIZE//2 - 2)
             # Fuse
             pygame.draw.line(surface, ORANGE, (ENEMY_SIZE//2, 5), (ENEMY_SIZE//2 + 5, 0), 3)
             # Skull or danger sign
             pygame.draw.circle(surface, RED, (ENEMY_SIZE//2, ENEMY_SIZE//2), 6)
-        
-        return surface
 
     @staticmethod
     def create_portal_sprite():
         surface = pygame.Surface((PORTAL_SIZE, PORTAL_SIZE), pygame.SRCALPHA)
+        SpriteFactory.draw_portal(surface)
+        return surface
+
+    @staticmethod
+    def draw_portal(surface):
         center = (PORTAL_SIZE // 2, PORTAL_SIZE // 2)
         radius = PORTAL_SIZE // 2
         
@@ -100,5 +121,52 @@ class SpriteFactory:
         # Inner swirl (simplified as concentric circles for now)
         pygame.draw.circle(surface, (100, 0, 100), center, radius - 8, 2)
         pygame.draw.circle(surface, (200, 100, 255), center, radius - 16)
-        
-        return surface
+
+    @classmethod
+    def build_atlas(cls):
+        # (key, size, rasterizer) for every variant the game can show
+        variants = [
+            (("player",), PLAYER_SIZE, SpriteFactory.draw_player),
+            (("portal",), PORTAL_SIZE, SpriteFactory.draw_portal),
+        ]
+        for enemy_type, colors in ENEMY_TIER_COLORS.items():
+            for tier in range(len(colors)):
+                draw = lambda surface, t=enemy_type, c=tier: SpriteFactory.draw_enemy(surface, t, c)
+                variants.append((("enemy", enemy_type, tier), ENEMY_SIZE, draw))
+
+        # Pack in a single row, padded so rasterizers can't bleed into neighbours
+        width = sum(size + ATLAS_PADDING for _, size, _ in variants)
+        height = max(size for _, size, _ in variants)
+        atlas = pygame.Surface((width, height), pygame.SRCALPHA)
+        rects = {}
+        x = 0
+        for key, size, draw in variants:
+            rects[key] = pygame.Rect(x, 0, size, size)
+            draw(atlas.subsurface(rects[key]))
+            x += size + ATLAS_PADDING
+
+        # Match the display format so blits skip per-pixel conversion
+        cls._atlas_converted = pygame.display.get_surface() is not None
+        if cls._atlas_converted:
+            atlas = atlas.convert_alpha()
+        cls._atlas = atlas
+        cls._sprites = {key: atlas.subsurface(rect) for key, rect in rects.items()}
+
+    @classmethod
+    def get_sprite(cls, key):
+        # Rebuild once the display exists if the atlas was made before set_mode
+        if cls._atlas is None or (not cls._atlas_converted and pygame.display.get_surface() is not None):
+            cls.build_atlas()
+        return cls._sprites[key]
+
+    @classmethod
+    def get_player_sprite(cls):
+        return cls.get_sprite(("player",))
+
+    @classmethod
+    def get_enemy_sprite(cls, enemy_type, hp_multiplier=1.0):
+        return cls.get_sprite(("enemy", enemy_type, cls.color_tier(enemy_type, hp_multiplier)))
+
+    @classmethod
+    def get_portal_sprite(cls):
+        return cls.get_sprite(("portal",))
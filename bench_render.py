@@ -0,0 +1,66 @@
+"""
+Frame-time comparison between the render backends.
+
+    python bench_render.py [frames]
+
+Each backend draws the same seeded level in a fresh process. SDL's dummy
+video driver and software render driver are used unless SDL_VIDEODRIVER /
+SDL_RENDER_DRIVER are already set, so this runs on a headless Linux box.
+"""
+import os
+import sys
+import json
+import random
+import subprocess
+import time
+
+BACKENDS = ["software", "sdl2"]
+
+def run_backend(backend, frames):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_RENDER_DRIVER", "software")
+    import pygame
+    from config import PLAYER_START_HP
+    from render import create_renderer
+    from game import Game
+
+    pygame.display.init()
+    pygame.font.init()
+    random.seed(1234)
+    renderer = create_renderer(backend)
+    game = Game(getattr(renderer, "screen", None), renderer)
+    game.state = "PLAYING"
+
+    times = []
+    for _ in range(frames):
+        game.update()
+        game.player.hp = PLAYER_START_HP # Keep the run in the PLAYING state
+        start = time.perf_counter()
+        renderer.present(game.draw())
+        times.append((time.perf_counter() - start) * 1000)
+
+    times.sort()
+    return {
+        "backend": renderer.name,
+        "frames": frames,
+        "avg_ms": sum(times) / len(times),
+        "p50_ms": times[len(times) // 2],
+        "p95_ms": times[int(len(times) * 0.95)],
+    }
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    if len(sys.argv) > 2:
+        # Child process: measure a single backend
+        print(json.dumps(run_backend(sys.argv[2], frames)))
+        return
+
+    for backend in BACKENDS:
+        out = subprocess.run([sys.executable, __file__, str(frames), backend],
+                             capture_output=True, text=True, check=True).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        print(f"{backend:>8} -> {result['backend']:<8} avg {result['avg_ms']:6.2f} ms  "
+              f"p50 {result['p50_ms']:6.2f} ms  p95 {result['p95_ms']:6.2f} ms  ({frames} frames)")
+
+if __name__ == "__main__":
+    main()
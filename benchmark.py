@@ -0,0 +1,218 @@
+"""
+Scripted frame benchmarks for the simulation and drawing hot paths.
+
+    python benchmark.py [--frames N] [--seed S] [--scenario NAME ...] [--no-draw] [--out FILE]
+
+Every scenario runs headless (see headless.py) for a fixed number of
+frames from a fixed seed. The JSON result has ms percentiles per profiler
+section (update, collision, enemies, projectiles, draw, ...) so runs can
+be diffed across commits.
+"""
+import sys
+import json
+import math
+import random
+import argparse
+import platform
+import subprocess
+import time
+
+def percentiles(values):
+    values = sorted(values)
+    n = len(values)
+    def rank(q):
+        return values[min(n - 1, int(math.ceil(q * n)) - 1)]
+    return {
+        "count": n,
+        "mean": sum(values) / n,
+        "p50": rank(0.50),
+        "p95": rank(0.95),
+        "p99": rank(0.99),
+        "max": values[-1],
+    }
+
+def summarize(frames):
+    # {section: percentiles} over the frames each section ran in, plus the
+    # whole frame (update + draw)
+    samples = {}
+    for frame in frames:
+        for name, ms in frame.items():
+            samples.setdefault(name, []).append(ms)
+        samples.setdefault("frame", []).append(frame.get("update", 0.0) + frame.get("draw", 0.0))
+    return {name: percentiles(values) for name, values in sorted(samples.items())}
+
+def start_run(seed, draw):
+    from headless import HeadlessRunner
+    runner = HeadlessRunner(draw=draw, seed=seed)
+    runner.start()
+    return runner
+
+def hold(game):
+    # Keep the run on this level in PLAYING with a fixed enemy count
+    from config import PLAYER_START_HP
+    game.player.hp = PLAYER_START_HP
+    game.spawn_timer = 0
+    game.state = "PLAYING"
+
+def populate(game, count):
+    # Replace the level's enemies with count awake enemies of mixed types on
+    # random floor tiles
+    from config import TILE_SIZE, ENEMY_MELEE, ENEMY_RANGED, ENEMY_DASHER, ENEMY_BOMBER
+    from entities import Enemy
+    for enemy in game.enemies.sprites():
+        enemy.kill()
+    floor = game.grid.floor_tiles()
+    types = [ENEMY_MELEE, ENEMY_RANGED, ENEMY_DASHER, ENEMY_BOMBER]
+    for _ in range(count):
+        tx, ty = game.rng.choice(floor)
+        x = tx * TILE_SIZE + TILE_SIZE // 2
+        y = ty * TILE_SIZE + TILE_SIZE // 2
+        enemy = Enemy(game.enemy_store, x, y, game.player, game.difficulty_multiplier, game.rng.choice(types))
+        game.all_sprites.add(enemy)
+        game.enemies.add(enemy)
+        game.activation.add(enemy)
+
+def select_weapon(player, index):
+    player.current_weapon_idx = index
+    player.weapon = player.weapon_list[index]
+
+def run_frames(runner, frames, before=None):
+    game = runner.game
+    results = []
+    peak_enemies = peak_projectiles = 0
+    # Paced against real time only to count the steps a live game would
+    # have dropped; every frame still runs exactly one step
+    timestep = game.timestep
+    timestep.advance(time.perf_counter())
+    for i in range(frames):
+        hold(game)
+        if before:
+            before(game, i)
+        runner.step()
+        timestep.advance(time.perf_counter())
+        frame = dict(runner.last_frame)
+        results.append(frame)
+        peak_enemies = max(peak_enemies, len(game.enemies))
+        peak_projectiles = max(peak_projectiles, len(game.projectiles))
+    return {
+        "frames": frames,
+        "sections": summarize(results),
+        "peak_enemies": peak_enemies,
+        "peak_projectiles": peak_projectiles,
+        "counters": game.stats(),
+    }
+
+def scenario_empty_dungeon(frames, seed, draw):
+    runner = start_run(seed, draw)
+    populate(runner.game, 0)
+    return run_frames(runner, frames)
+
+def enemy_scenario(count):
+    def scenario(frames, seed, draw):
+        runner = start_run(seed, draw)
+        populate(runner.game, count)
+        return run_frames(runner, frames)
+    return scenario
+
+def scenario_machinegun(frames, seed, draw):
+    # Held trigger with 50 enemies around, sweeping the aim
+    runner = start_run(seed, draw)
+    game = runner.game
+    populate(game, 50)
+    select_weapon(game.player, 3)
+    def fire(game, i):
+        angle = i * 0.05
+        game.player.shoot_dir(game.projectiles, (math.cos(angle), math.sin(angle)))
+    return run_frames(runner, frames, fire)
+
+def scenario_shotgun_spam(frames, seed, draw):
+    # A shotgun blast every frame, cooldown ignored
+    runner = start_run(seed, draw)
+    game = runner.game
+    populate(game, 50)
+    select_weapon(game.player, 2)
+    def fire(game, i):
+        game.player.weapon.current_cooldown = 0
+        angle = i * 0.1
+        game.player.shoot_dir(game.projectiles, (math.cos(angle), math.sin(angle)))
+    return run_frames(runner, frames, fire)
+
+def scenario_level_transition(frames, seed, draw):
+    # Game.next_level every tenth frame, timed in its own section
+    runner = start_run(seed, draw)
+    def advance(game, i):
+        if i % 10 == 0:
+            game.next_level()
+    return run_frames(runner, frames, advance)
+
+def scenario_dungeon_generate(frames, seed, draw):
+    # Generator throughput on its own, one fresh dungeon per frame
+    from dungeon import DungeonGenerator
+    times = []
+    for i in range(frames):
+        rng = random.Random(seed + i)
+        start = time.perf_counter()
+        DungeonGenerator(rng).generate()
+        times.append((time.perf_counter() - start) * 1000)
+    stats = percentiles(times)
+    return {
+        "frames": frames,
+        "sections": {"generate": stats},
+        "per_second": 1000 / stats["mean"],
+    }
+
+SCENARIOS = {
+    "empty_dungeon": scenario_empty_dungeon,
+    "enemies_50": enemy_scenario(50),
+    "enemies_200": enemy_scenario(200),
+    "enemies_1000": enemy_scenario(1000),
+    "machinegun": scenario_machinegun,
+    "shotgun_spam": scenario_shotgun_spam,
+    "level_transition": scenario_level_transition,
+    "dungeon_generate": scenario_dungeon_generate,
+}
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Scripted frame benchmarks")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="run only these scenarios (repeatable)")
+    parser.add_argument("--no-draw", action="store_true", help="skip Game.draw")
+    parser.add_argument("--out", help="write the JSON here instead of stdout")
+    args = parser.parse_args()
+
+    import pygame
+    import numpy
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": numpy.__version__,
+            "frames": args.frames,
+            "seed": args.seed,
+            "draw": not args.no_draw,
+        },
+        "scenarios": {},
+    }
+    for name in args.scenario or SCENARIOS:
+        print(f"running {name}", file=sys.stderr)
+        results["scenarios"][name] = SCENARIOS[name](args.frames, args.seed, not args.no_draw)
+
+    text = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
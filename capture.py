@@ -0,0 +1,58 @@
+import os
+import json
+import time
+import cProfile
+from config import *
+
+class FrameCapture:
+    """
+    Records every profiler section of the next `frames` frames as complete
+    ("X") events in Trace Event Format, one span per frame on top, and
+    optionally runs cProfile over the same frames. Nested sections come
+    out as nested spans in Perfetto or chrome://tracing.
+    """
+    def __init__(self, frames=CAPTURE_FRAMES, profile=CAPTURE_CPROFILE, out_dir=CAPTURE_DIR):
+        self.frames = frames
+        self.out_dir = out_dir
+        self.events = []
+        self.frame = 0
+        self.origin = time.perf_counter()
+        self.frame_start = self.origin
+        self.profile = cProfile.Profile() if profile else None
+        if self.profile:
+            self.profile.enable()
+
+    def span(self, name, start, end, cat="section"):
+        # start and end are perf_counter() seconds. Sections already open
+        # when the capture began are cut at its start.
+        start = max(start, self.origin)
+        self.events.append({
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": (start - self.origin) * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": 1,
+            "tid": 1,
+        })
+
+    def end_frame(self, now):
+        # True once the last frame is in
+        self.span(f"frame {self.frame}", self.frame_start, now, "frame")
+        self.frame_start = now
+        self.frame += 1
+        return self.frame >= self.frames
+
+    def save(self):
+        # Writes trace-<stamp>.json (and .prof), returns the paths
+        if self.profile:
+            self.profile.disable()
+        os.makedirs(self.out_dir, exist_ok=True)
+        base = os.path.join(self.out_dir, time.strftime("trace-%Y%m%d-%H%M%S"))
+        paths = [base + ".json"]
+        with open(paths[0], "w") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+        if self.profile:
+            paths.append(base + ".prof")
+            self.profile.dump_stats(paths[1])
+        return paths
@@ -0,0 +1,124 @@
+import math
+from config import *
+from tilegrid import WALL
+
+class TileCollider:
+    """
+    Axis-separated AABB collision against the solid cells of a tile grid.
+    Only the tiles a box overlaps are looked at, so the cost per mover does
+    not depend on the size of the map. Positions are floats.
+    """
+    def __init__(self, grid, tile_size=TILE_SIZE):
+        self.grid = grid # Frozen TileGrid, shared with the tile map and flow field
+        self.height = grid.height
+        self.width = grid.width
+        self.tile_size = tile_size
+        self.cells = grid.view # For scalar lookups
+        self.solid = grid.solid # For vectorized lookups
+
+    def is_solid(self, tx, ty):
+        # Anything outside the map counts as wall
+        if tx < 0 or ty < 0 or tx >= self.width or ty >= self.height:
+            return True
+        return self.cells[ty, tx] == WALL
+
+    def solid_at(self, tx, ty):
+        # Vectorized is_solid over integer tile index arrays
+        inside = (tx >= 0) & (ty >= 0) & (tx < self.width) & (ty < self.height)
+        result = ~inside
+        result[inside] = self.solid[ty[inside], tx[inside]]
+        return result
+
+    def tile_span(self, start, size):
+        # First and last tile index covered by [start, start + size)
+        ts = self.tile_size
+        return math.floor(start / ts), math.ceil((start + size) / ts) - 1
+
+    def column_blocked(self, tx, ty0, ty1):
+        for ty in range(ty0, ty1 + 1):
+            if self.is_solid(tx, ty):
+                return True
+        return False
+
+    def row_blocked(self, ty, tx0, tx1):
+        for tx in range(tx0, tx1 + 1):
+            if self.is_solid(tx, ty):
+                return True
+        return False
+
+    def move_x(self, x, y, w, h, dx):
+        if dx == 0:
+            return x
+        ts = self.tile_size
+        ty0, ty1 = self.tile_span(y, h)
+        if dx > 0:
+            # Sweep the leading edge over every column it enters and stop at
+            # the first one with a solid tile in any overlapped row
+            for tx in range(math.ceil((x + w) / ts), math.ceil((x + w + dx) / ts)):
+                if self.column_blocked(tx, ty0, ty1):
+                    return tx * ts - w
+        else:
+            for tx in range(math.floor(x / ts) - 1, math.floor((x + dx) / ts) - 1, -1):
+                if self.column_blocked(tx, ty0, ty1):
+                    return (tx + 1) * ts
+        return x + dx
+
+    def move_y(self, x, y, w, h, dy):
+        if dy == 0:
+            return y
+        ts = self.tile_size
+        tx0, tx1 = self.tile_span(x, w)
+        if dy > 0:
+            for ty in range(math.ceil((y + h) / ts), math.ceil((y + h + dy) / ts)):
+                if self.row_blocked(ty, tx0, tx1):
+                    return ty * ts - h
+        else:
+            for ty in range(math.floor(y / ts) - 1, math.floor((y + dy) / ts) - 1, -1):
+                if self.row_blocked(ty, tx0, tx1):
+                    return (ty + 1) * ts
+        return y + dy
+
+    def move(self, x, y, w, h, dx, dy):
+        # Move along X then Y so boxes slide along walls
+        x = self.move_x(x, y, w, h, dx)
+        y = self.move_y(x, y, w, h, dy)
+        return x, y
+
+    def raycast(self, x0, y0, x1, y1):
+        # Grid DDA along the segment (x0, y0) -> (x1, y1). Returns the point
+        # where it first enters a solid tile, or None. Cost is the number of
+        # tiles crossed, so fast projectiles can't skip through corners.
+        ts = self.tile_size
+        tx, ty = math.floor(x0 / ts), math.floor(y0 / ts)
+        if self.is_solid(tx, ty):
+            return (x0, y0)
+
+        dx = x1 - x0
+        dy = y1 - y0
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        # Segment parameter t at the next vertical / horizontal tile boundary
+        if dx != 0:
+            t_max_x = ((tx + (step_x > 0)) * ts - x0) / dx
+            t_delta_x = ts / abs(dx)
+        else:
+            t_max_x = t_delta_x = math.inf
+        if dy != 0:
+            t_max_y = ((ty + (step_y > 0)) * ts - y0) / dy
+            t_delta_y = ts / abs(dy)
+        else:
+            t_max_y = t_delta_y = math.inf
+
+        steps = abs(math.floor(x1 / ts) - tx) + abs(math.floor(y1 / ts) - ty)
+        for _ in range(steps):
+            if t_max_x < t_max_y:
+                t = t_max_x
+                tx += step_x
+                t_max_x += t_delta_x
+            else:
+                t = t_max_y
+                ty += step_y
+                t_max_y += t_delta_y
+            if self.is_solid(tx, ty):
+                return (x0 + dx * t, y0 + dy * t)
+        return None
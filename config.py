@@ -1,3 +1,4 @@
+import os
 import pygame
 
 # Screen
@@ -6,6 +7,55 @@ SCREEN_HEIGHT = 768
 FPS = 60
 TITLE = "Soul Guardian - Roguelike Prototype"
 
+# Rendering
+# "software" blits onto the display surface, "sdl2" draws through an SDL2
+# Renderer with textures. Override with the SG_RENDERER environment variable.
+RENDER_BACKEND = os.environ.get("SG_RENDERER", "software")
+# Internal resolution factor for drawing (e.g. 0.5 or 0.75), upscaled to the
+# window. Lower values trade sharpness for fill rate on weak GPUs.
+RENDER_SCALE = float(os.environ.get("SG_RENDER_SCALE", "1.0"))
+# Open the display with pygame.SCALED so SDL does the upscale, and/or vsync
+DISPLAY_SCALED = os.environ.get("SG_SCALED", "0") == "1"
+DISPLAY_VSYNC = os.environ.get("SG_VSYNC", "0") == "1"
+# Frame rate cap for drawing, 0 = none. Once vsync is actually applied it
+# paces frames by itself and the default cap is none.
+MAX_RENDER_FPS = int(os.environ.get("SG_MAX_FPS", str(FPS)))
+VSYNC_MAX_FPS = int(os.environ.get("SG_MAX_FPS", "0"))
+
+# Simulation runs in fixed steps, decoupled from the render rate
+SIM_RATE = FPS  # steps per second, every frame-counted timer counts steps
+MAX_CATCH_UP_STEPS = 5  # most steps run for one rendered frame
+
+# Profiler overlay, toggled in game with F3 or a three-finger tap. Sections
+# are only timed while it is shown. SG_PROFILE=1 shows it from the start.
+PROFILER_OVERLAY = os.environ.get("SG_PROFILE", "0") == "1"
+PROFILER_HISTORY = 240  # frames kept per section
+PROFILER_REFRESH = 15  # frames between redraws of the stats text
+PROFILER_GRAPH_MS = 33.3  # frame time at the top of the graph
+
+# Frame capture, started in game with F4 or a four-finger tap, or at launch
+# with SG_CAPTURE=<frames>. Writes a Trace Event JSON (Perfetto or
+# chrome://tracing) and, with SG_CAPTURE_CPROFILE=1, a cProfile .prof.
+CAPTURE_AT_START = int(os.environ.get("SG_CAPTURE", "0"))
+CAPTURE_FRAMES = CAPTURE_AT_START or 300
+CAPTURE_CPROFILE = os.environ.get("SG_CAPTURE_CPROFILE", "0") == "1"
+# On Android p4a points ANDROID_PRIVATE at the app's private storage
+CAPTURE_DIR = os.environ.get("SG_CAPTURE_DIR") or os.path.join(os.environ.get("ANDROID_PRIVATE", "."), "captures")
+
+# Session seed (random if unset) and input recording, see replay.py.
+# SG_RECORD=1 records to CAPTURE_DIR, any other value is the file path.
+RUN_SEED = int(os.environ["SG_SEED"]) if os.environ.get("SG_SEED") else None
+RECORD_PATH = os.environ.get("SG_RECORD", "")
+
+# Draw layers, back to front
+LAYER_FLOOR = 0
+LAYER_PORTAL = 1
+LAYER_ENEMIES = 2
+LAYER_PLAYER = 3
+LAYER_PROJECTILES = 4
+LAYER_FX = 5
+LAYER_COUNT = 6
+
 # Map / Dungeon
 TILE_SIZE = 48
 MAP_WIDTH = 50   # in tiles
@@ -13,6 +63,8 @@ MAP_HEIGHT = 50  # in tiles
 ROOM_MAX_SIZE = 15
 ROOM_MIN_SIZE = 6
 MAX_ROOMS = 20
+TILEMAP_CHUNK_SIZE = 8  # tiles per side of a pre-rendered map chunk
+COLLISION_CELL_SIZE = TILE_SIZE  # spatial hash cell used for entity collisions
 
 # Colors
 WHITE = (255, 255, 255)
@@ -44,6 +96,9 @@ SWORD_DAMAGE = 30
 SWORD_RANGE = 60
 SWORD_COOLDOWN = 30
 SWORD_COLOR = (200, 200, 255)
+SWORD_SLASH_SIZE = 32
+SWORD_SLASH_SPEED = 5
+SWORD_SLASH_LIFETIME = 5 # frames
 
 # Player Skills
 SKILL_DASH_SPEED = 15
@@ -54,11 +109,23 @@ SKILL_DASH_COOLDOWN = 120 # frames (2 seconds)
 BULLET_SPEED = 12
 BULLET_SIZE = 8
 BULLET_COLOR = YELLOW
+BULLET_LIFETIME = 100 # frames
+
+# Projectile pool. Shots fired while it is full are dropped.
+MAX_PROJECTILES = 4096
 
 # Enemy
 ENEMY_SPEED = 2.5
 ENEMY_SIZE = 32
 ENEMY_SPAWN_RATE = 180  # frames
+ENEMY_STORE_INITIAL_CAPACITY = 64  # enemy slots, grows by doubling
+
+# Enemy activation
+ENEMY_WAKE_MARGIN = 3  # tiles around a room where the player wakes its enemies
+ENEMY_SLEEP_DISTANCE = 1200  # pixels from the player before an enemy can fall asleep
+ENEMY_SLEEP_CHECK_INTERVAL = 30  # frames
+FLOW_FIELD_RADIUS = 64  # path steps searched from the player's tile
+LOS_CACHE_SIZE = 4096  # cached tile pairs for ranged enemy line of sight
 
 # Enemy Types
 ENEMY_MELEE = "Melee"
@@ -104,12 +171,18 @@ THEMES = [
 ENEMY_BULLET_SPEED = 6
 ENEMY_BULLET_SIZE = 10
 ENEMY_BULLET_COLOR = ORANGE
+ENEMY_BULLET_DAMAGE = 5
+ENEMY_BULLET_LIFETIME = 300 # frames
 
 # Portal
 PORTAL_SIZE = 40
 PORTAL_COLOR = PURPLE
 
+# Sprite atlas
+ATLAS_PADDING = 2  # transparent pixels between packed sprites
+
 # UI
 FONT_SIZE_LARGE = 48  # Reduced from 64 to fit long titles on 1024 width
 FONT_SIZE_MEDIUM = 32
 FONT_SIZE_SMALL = 24
+TEXT_CACHE_SIZE = 256  # rendered text surfaces kept in the LRU
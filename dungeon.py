@@ -1,14 +1,7 @@
 import pygame
 import random
 from config import *
-
-class Wall(pygame.sprite.Sprite):
-    def __init__(self, x, y, color=DARK_GRAY):
-        super().__init__()
-        self.image = pygame.Surface((TILE_SIZE, TILE_SIZE))
-        self.image.fill(color)
-        self.rect = self.image.get_rect()
-        self.rect.topleft = (x * TILE_SIZE, y * TILE_SIZE)
+from tilegrid import TileGrid, WALL
 
 class Room:
     def __init__(self, x, y, w, h):
@@ -19,19 +12,21 @@ class Room:
         return self.rect.colliderect(other.rect.inflate(2, 2))  # Add padding
 
 class DungeonGenerator:
-    def __init__(self):
+    def __init__(self, rng=None):
+        self.rng = rng or random # random.Random of the run, or the global one
         self.width = MAP_WIDTH
         self.height = MAP_HEIGHT
-        self.grid = [[1 for _ in range(self.width)] for _ in range(self.height)] # 1 = Wall, 0 = Floor
+        self.grid = TileGrid(self.width, self.height, WALL) # Carved, then frozen by generate()
         self.rooms = []
 
     def generate(self):
+        rng = self.rng
         # Place Rooms
         for _ in range(MAX_ROOMS):
-            w = random.randint(ROOM_MIN_SIZE, ROOM_MAX_SIZE)
-            h = random.randint(ROOM_MIN_SIZE, ROOM_MAX_SIZE)
-            x = random.randint(1, self.width - w - 1)
-            y = random.randint(1, self.height - h - 1)
+            w = rng.randint(ROOM_MIN_SIZE, ROOM_MAX_SIZE)
+            h = rng.randint(ROOM_MIN_SIZE, ROOM_MAX_SIZE)
+            x = rng.randint(1, self.width - w - 1)
+            y = rng.randint(1, self.height - h - 1)
 
             new_room = Room(x, y, w, h)
             
@@ -49,7 +44,7 @@ class DungeonGenerator:
                     prev_center = self.rooms[-1].center
                     new_center = new_room.center
                     
-                    if random.randint(0, 1) == 1:
+                    if rng.randint(0, 1) == 1:
                         self.create_h_tunnel(prev_center[0], new_center[0], prev_center[1])
                         self.create_v_tunnel(prev_center[1], new_center[1], new_center[0])
                     else:
@@ -58,27 +53,15 @@ class DungeonGenerator:
                 
                 self.rooms.append(new_room)
 
-        return self.grid, self.rooms
+        return self.grid.freeze(), self.rooms
 
     def create_room(self, room):
-        for y in range(room.rect.y, room.rect.y + room.rect.h):
-            for x in range(room.rect.x, room.rect.x + room.rect.w):
-                self.grid[y][x] = 0
+        self.grid.carve(*room.rect)
 
     def create_h_tunnel(self, x1, x2, y):
-        for x in range(min(x1, x2), max(x1, x2) + 1):
-            self.grid[y][x] = 0
-            self.grid[y+1][x] = 0 # Make tunnel wider
+        # Two tiles tall to make the tunnel wider
+        self.grid.carve(min(x1, x2), y, abs(x2 - x1) + 1, 2)
 
     def create_v_tunnel(self, y1, y2, x):
-        for y in range(min(y1, y2), max(y1, y2) + 1):
-            self.grid[y][x] = 0
-            self.grid[y][x+1] = 0 # Make tunnel wider
-
-    def build_walls(self, wall_color=DARK_GRAY):
-        walls = pygame.sprite.Group()
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.grid[y][x] == 1:
-                    walls.add(Wall(x, y, wall_color))
-        return walls
+        # Two tiles wide to make the tunnel wider
+        self.grid.carve(x, min(y1, y2), 2, abs(y2 - y1) + 1)
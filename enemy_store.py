@@ -0,0 +1,193 @@
+import numpy as np
+from config import *
+from projectiles import OWNER_ENEMY, KIND_ENEMY_BULLET
+
+# Enemy types as array codes
+TYPE_MELEE = 0
+TYPE_RANGED = 1
+TYPE_DASHER = 2
+TYPE_BOMBER = 3
+
+TYPE_CODES = {
+    ENEMY_MELEE: TYPE_MELEE,
+    ENEMY_RANGED: TYPE_RANGED,
+    ENEMY_DASHER: TYPE_DASHER,
+    ENEMY_BOMBER: TYPE_BOMBER,
+}
+
+# Speed, base hp and starting cooldown per type
+TYPE_STATS = {
+    ENEMY_MELEE: (MELEE_SPEED, MELEE_HP_BASE, 0),
+    ENEMY_RANGED: (RANGED_SPEED, RANGED_HP_BASE, RANGED_COOLDOWN),
+    ENEMY_DASHER: (DASHER_SPEED, DASHER_HP_BASE, 0),
+    ENEMY_BOMBER: (BOMBER_SPEED, BOMBER_HP_BASE, 0),
+}
+
+class EnemyStore:
+    """
+    Simulation state of every enemy on the level in NumPy arrays: float
+    top-left position, box size, speed, hp, attack cooldown and type code.
+    Steering, kiting, cooldowns and the common case of wall collision run
+    as one vectorized pass. Enemy sprites are views onto a slot here.
+    """
+    def __init__(self, capacity=ENEMY_STORE_INITIAL_CAPACITY):
+        self.capacity = 0
+        self.sprites = []
+        self.free = []
+        self.allocate(capacity)
+
+    def allocate(self, capacity):
+        # Grow every array to capacity, keeping the existing slots
+        n = self.capacity
+        for name, dtype in (("x", np.float64), ("y", np.float64), ("prev_x", np.float64), ("prev_y", np.float64),
+                            ("w", np.float64), ("h", np.float64),
+                            ("speed", np.float64), ("hp", np.float64), ("cooldown", np.int32),
+                            ("type", np.int8), ("alive", np.bool_)):
+            array = np.zeros(capacity, dtype=dtype)
+            if n:
+                array[:n] = getattr(self, name)
+            setattr(self, name, array)
+        self.sprites.extend([None] * (capacity - n))
+        self.free.extend(range(capacity - 1, n - 1, -1))
+        self.capacity = capacity
+
+    def add(self, sprite, x, y, enemy_type, hp_multiplier):
+        # Claim a slot for sprite, whose rect already has its size and place
+        if not self.free:
+            self.allocate(self.capacity * 2)
+        i = self.free.pop()
+        speed, hp, cooldown = TYPE_STATS[enemy_type]
+        self.x[i] = self.prev_x[i] = x
+        self.y[i] = self.prev_y[i] = y
+        self.w[i] = sprite.rect.width
+        self.h[i] = sprite.rect.height
+        self.speed[i] = speed
+        self.hp[i] = hp * hp_multiplier
+        self.cooldown[i] = cooldown
+        self.type[i] = TYPE_CODES[enemy_type]
+        self.alive[i] = True
+        self.sprites[i] = sprite
+        return i
+
+    def release(self, i):
+        if self.alive[i]:
+            self.alive[i] = False
+            self.sprites[i] = None
+            self.free.append(i)
+
+    def __len__(self):
+        return self.capacity - len(self.free)
+
+    def slots(self, sprites):
+        return np.fromiter((sprite.slot for sprite in sprites), dtype=np.int64)
+
+    def update(self, collider, target, sprites, flow=None):
+        # Steer, tick cooldowns and move the given enemies towards target,
+        # along the flow field when one is given
+        # Everyone's previous position, sleeping enemies included, for drawing
+        # between steps
+        self.prev_x[:] = self.x
+        self.prev_y[:] = self.y
+        slots = self.slots(sprites)
+        if len(slots) == 0:
+            return
+        x, y = self.x[slots], self.y[slots]
+        w, h = self.w[slots], self.h[slots]
+        kind = self.type[slots]
+        speed = self.speed[slots]
+
+        px, py = target.rect.center
+        cx = x + w / 2
+        cy = y + h / 2
+        dx = px - cx
+        dy = py - cy
+        dist = np.hypot(dx, dy)
+
+        # Melee, dashers and bombers chase. Ranged enemies close in, back off
+        # when too close and hold still in between.
+        ranged = kind == TYPE_RANGED
+        heading = np.ones(len(slots))
+        heading[ranged & (dist <= RANGED_ATTACK_RANGE)] = 0
+        retreat = ranged & (dist < RANGED_ATTACK_RANGE - 50)
+        heading[retreat] = -1
+
+        if flow is not None:
+            # Closing in more than a tile away walks towards the centre of
+            # the next tile on the shortest path; adjacent enemies, retreats
+            # and tiles the field didn't reach go straight
+            ts = collider.tile_size
+            tx = np.floor(cx / ts).astype(np.int64)
+            ty = np.floor(cy / ts).astype(np.int64)
+            steps, step_x, step_y = flow.lookup(tx, ty)
+            follow = (steps > 1) & ~retreat
+            dx = np.where(follow, (tx + step_x + 0.5) * ts - cx, dx)
+            dy = np.where(follow, (ty + step_y + 0.5) * ts - cy, dy)
+            length = np.hypot(dx, dy)
+        else:
+            length = dist
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ux = np.where(length > 0, dx / length, 1.0)
+            uy = np.where(length > 0, dy / length, 0.0)
+
+        cooldown = self.cooldown[slots]
+        self.cooldown[slots] = np.where(ranged & (cooldown > 0), cooldown - 1, cooldown)
+
+        step = speed * heading
+        moving = step != 0
+        if not moving.any():
+            return
+        slots = slots[moving]
+        x, y, w, h = x[moving], y[moving], w[moving], h[moving]
+        new_x = x + ux[moving] * step[moving]
+        new_y = y + uy[moving] * step[moving]
+
+        # A box moving less than a tile whose moved boxes touch no wall ends
+        # up exactly where it was headed, so only the rest take the swept
+        # per-enemy path
+        clear = self.box_clear(collider, new_x, y, w, h) & self.box_clear(collider, new_x, new_y, w, h)
+        clear &= (np.abs(new_x - x) < collider.tile_size) & (np.abs(new_y - y) < collider.tile_size)
+        for j in np.flatnonzero(~clear):
+            new_x[j], new_y[j] = collider.move(x[j], y[j], w[j], h[j], new_x[j] - x[j], new_y[j] - y[j])
+
+        self.x[slots] = new_x
+        self.y[slots] = new_y
+        sprites = self.sprites
+        for i, rx, ry in zip(slots.tolist(), np.round(new_x).astype(np.int64).tolist(), np.round(new_y).astype(np.int64).tolist()):
+            sprites[i].rect.topleft = (rx, ry)
+
+    def box_clear(self, collider, x, y, w, h):
+        # True where a box smaller than a tile overlaps no solid tile. Its
+        # corners cover every tile it touches.
+        ts = collider.tile_size
+        tx0 = np.floor(x / ts).astype(np.int64)
+        ty0 = np.floor(y / ts).astype(np.int64)
+        tx1 = np.ceil((x + w) / ts).astype(np.int64) - 1
+        ty1 = np.ceil((y + h) / ts).astype(np.int64) - 1
+        solid = collider.solid_at(tx0, ty0) | collider.solid_at(tx1, ty0)
+        solid |= collider.solid_at(tx0, ty1) | collider.solid_at(tx1, ty1)
+        return ~solid
+
+    def fire(self, projectiles, target, sprites, sight=None):
+        # Ranged enemies off cooldown shoot at target when it is in range
+        # and, given a line of sight service, not behind a wall. The others
+        # stay ready and fire as soon as they get a clear shot.
+        slots = self.slots(sprites)
+        if len(slots) == 0:
+            return
+        ready = slots[(self.type[slots] == TYPE_RANGED) & (self.cooldown[slots] <= 0)]
+        if len(ready) == 0:
+            return
+        px, py = target.rect.center
+        ex = self.x[ready] + self.w[ready] / 2
+        ey = self.y[ready] + self.h[ready] / 2
+        in_range = np.hypot(px - ex, py - ey) <= RANGED_ATTACK_RANGE
+        ready, ex, ey = ready[in_range], ex[in_range], ey[in_range]
+        if sight is not None and len(ready):
+            clear = np.fromiter((sight.visible(x, y, px, py) for x, y in zip(ex.tolist(), ey.tolist())), dtype=np.bool_, count=len(ready))
+            ready, ex, ey = ready[clear], ex[clear], ey[clear]
+        if len(ready) == 0:
+            return
+        self.cooldown[ready] = RANGED_COOLDOWN
+        angles = np.arctan2(py - ey, px - ex)
+        for cx, cy, angle in zip(ex.tolist(), ey.tolist(), angles.tolist()):
+            projectiles.spawn(cx, cy, angle, ENEMY_BULLET_SPEED, ENEMY_BULLET_DAMAGE, ENEMY_BULLET_LIFETIME, OWNER_ENEMY, KIND_ENEMY_BULLET)
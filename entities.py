@@ -1,16 +1,25 @@
 import pygame
 import math
+import random
 from config import *
-from weapons import Pistol, Shotgun, MachineGun, Bullet, Sword, Weapon
+from weapons import Pistol, Shotgun, MachineGun, Sword, Weapon
 from assets import SpriteFactory
+from input_source import PygameInput
 
 class Player(pygame.sprite.Sprite):
-    def __init__(self, x, y, hp=None, weapon_idx=0):
+    layer = LAYER_PLAYER
+    interpolated = True
+
+    def __init__(self, x, y, hp=None, weapon_idx=0, input_source=None, rng=None):
         super().__init__()
-        self.image = SpriteFactory.create_player_sprite()
+        self.input = input_source or PygameInput() # Keyboard and mouse state
+        self.rng = rng or random # Weapon spread
+        self.image = SpriteFactory.get_player_sprite()
         self.original_image = self.image # Keep original for rotation if needed
         self.rect = self.image.get_rect()
         self.rect.center = (x, y)
+        self.pos = pygame.math.Vector2(self.rect.topleft) # Float position, rect follows it
+        self.prev_pos = pygame.math.Vector2(self.pos) # Position one simulation step ago
         self.speed = PLAYER_SPEED
         self.hp = hp if hp is not None else PLAYER_START_HP
         self.weapon_list = [Sword(), Pistol(), Shotgun(), MachineGun()]
@@ -22,6 +31,19 @@ class Player(pygame.sprite.Sprite):
         self.dash_timer = 0
         self.dash_direction = (0, 0)
 
+    def set_center(self, x, y):
+        self.rect.center = (x, y)
+        self.pos.update(self.rect.topleft)
+        self.prev_pos.update(self.pos)
+
+    def draw_pos(self, alpha):
+        return self.prev_pos.lerp(self.pos, alpha)
+
+    def move(self, dx, dy, collider):
+        x, y = collider.move(self.pos.x, self.pos.y, self.rect.width, self.rect.height, dx, dy)
+        self.pos.update(x, y)
+        self.rect.topleft = (round(x), round(y))
+
     def switch_weapon(self):
         self.current_weapon_idx = (self.current_weapon_idx + 1) % len(self.weapon_list)
         self.weapon = self.weapon_list[self.current_weapon_idx]
@@ -37,7 +59,7 @@ class Player(pygame.sprite.Sprite):
                 return
 
             # Determine dash direction
-            keys = pygame.key.get_pressed()
+            keys = self.input.keys()
             dx, dy = 0, 0
             if keys[pygame.K_w]: dy = -1
             if keys[pygame.K_s]: dy = 1
@@ -46,7 +68,7 @@ class Player(pygame.sprite.Sprite):
             
             # If no key pressed, dash towards mouse
             if dx == 0 and dy == 0:
-                mx, my = pygame.mouse.get_pos()
+                mx, my = self.input.mouse_pos()
                 px, py = self.rect.center
                 # Need camera offset here really, but let's approximate or just dash forward
                 # Without camera info inside Player, mouse pos is screen relative.
@@ -61,7 +83,9 @@ class Player(pygame.sprite.Sprite):
             else:
                 self.dash_direction = (1, 0) # Default right
 
-    def update(self, walls, move_vec=None, aim_vec=None):
+    def update(self, collider, move_vec=None, aim_vec=None):
+        self.prev_pos.update(self.pos)
+        
         # Update Cooldowns
         if self.skill_cooldown > 0:
             self.skill_cooldown -= 1
@@ -75,10 +99,7 @@ class Player(pygame.sprite.Sprite):
             # Dash Movement (Ignore collision? Or just fast?)
             # Let's move fast but still collide
             speed = SKILL_DASH_SPEED
-            self.rect.x += self.dash_direction[0] * speed
-            self.collide(walls, 'x')
-            self.rect.y += self.dash_direction[1] * speed
-            self.collide(walls, 'y')
+            self.move(self.dash_direction[0] * speed, self.dash_direction[1] * speed, collider)
             return # Skip normal movement
 
         # Normal Movement
@@ -96,7 +117,7 @@ class Player(pygame.sprite.Sprite):
             dy *= self.speed
         else:
             # Keyboard input
-            keys = pygame.key.get_pressed()
+            keys = self.input.keys()
             if keys[pygame.K_w]: dy = -1
             if keys[pygame.K_s]: dy = 1
             if keys[pygame.K_a]: dx = -1
@@ -108,37 +129,12 @@ class Player(pygame.sprite.Sprite):
                 dx = dx / length * self.speed
                 dy = dy / length * self.speed
             
-        # Move X and check collision
-        self.rect.x += dx
-        self.collide(walls, 'x')
-        
-        # Move Y and check collision
-        self.rect.y += dy
-        self.collide(walls, 'y')
-        
-        # Boundary Check (Map limits)
-        if self.rect.left < 0: self.rect.left = 0
-        if self.rect.right > MAP_WIDTH * TILE_SIZE: self.rect.right = MAP_WIDTH * TILE_SIZE
-        if self.rect.top < 0: self.rect.top = 0
-        if self.rect.bottom > MAP_HEIGHT * TILE_SIZE: self.rect.bottom = MAP_HEIGHT * TILE_SIZE
-
-    def collide(self, walls, direction):
-        hits = pygame.sprite.spritecollide(self, walls, False)
-        if hits:
-            if direction == 'x':
-                if self.rect.centerx < hits[0].rect.centerx: # Moving right
-                    self.rect.right = hits[0].rect.left
-                else: # Moving left
-                    self.rect.left = hits[0].rect.right
-            if direction == 'y':
-                if self.rect.centery < hits[0].rect.centery: # Moving down
-                    self.rect.bottom = hits[0].rect.top
-                else: # Moving up
-                    self.rect.top = hits[0].rect.bottom
+        # Move X then Y against the tile grid (the map edge counts as wall)
+        self.move(dx, dy, collider)
 
     def shoot(self):
         # Calculate direction towards mouse
-        mx, my = pygame.mouse.get_pos()
+        mx, my = self.input.mouse_pos()
         # Adjust for camera offset (will need to implement camera later, but for now assuming direct mapping)
         # Wait, if we implement camera, mouse position needs adjustment. 
         # For now, let's assume no camera or pass camera offset.
@@ -147,7 +143,7 @@ class Player(pygame.sprite.Sprite):
         # No, better to pass target position to shoot() from Game class.
         pass
 
-    def shoot_at(self, target_pos):
+    def shoot_at(self, projectiles, target_pos):
         # target_pos is (x, y) relative to screen or world?
         # In handle_input, we calculated it relative to camera top-left, so it's world coordinates relative to (0,0) of screen?
         # Actually handle_input passed (mx - cx, my - cy).
@@ -158,135 +154,66 @@ class Player(pygame.sprite.Sprite):
         px, py = self.rect.center
         angle = math.atan2(ty - py, tx - px)
         
-        return self.weapon.shoot(self.rect.centerx, self.rect.centery, angle)
+        return self.weapon.shoot(projectiles, self.rect.centerx, self.rect.centery, angle, self.rng)
 
-    def shoot_dir(self, aim_vec):
+    def shoot_dir(self, projectiles, aim_vec):
         if aim_vec[0] == 0 and aim_vec[1] == 0:
-            return []
+            return 0
         
         angle = math.atan2(aim_vec[1], aim_vec[0])
-        return self.weapon.shoot(self.rect.centerx, self.rect.centery, angle)
-
-class EnemyBullet(pygame.sprite.Sprite):
-    def __init__(self, x, y, angle):
-        super().__init__()
-        self.image = pygame.Surface((ENEMY_BULLET_SIZE, ENEMY_BULLET_SIZE))
-        self.image.fill(ENEMY_BULLET_COLOR)
-        # Make it circular
-        pygame.draw.circle(self.image, ENEMY_BULLET_COLOR, (ENEMY_BULLET_SIZE//2, ENEMY_BULLET_SIZE//2), ENEMY_BULLET_SIZE//2)
-        
-        self.rect = self.image.get_rect()
-        self.rect.center = (x, y)
-        self.speed = ENEMY_BULLET_SPEED
-        self.dx = math.cos(angle) * self.speed
-        self.dy = math.sin(angle) * self.speed
-
-    def update(self):
-        self.rect.x += self.dx
-        self.rect.y += self.dy
-        
-        # Kill if off screen/map limits (simplified)
-        # Actually better to let Game class handle wall collisions or just lifetime
-        pass
+        return self.weapon.shoot(projectiles, self.rect.centerx, self.rect.centery, angle, self.rng)
 
 class Enemy(pygame.sprite.Sprite):
-    def __init__(self, x, y, target, hp_multiplier=1.0, enemy_type=ENEMY_MELEE):
+    """
+    Render and collision view of one enemy. Position, hp, speed and
+    cooldown live in a slot of the level's EnemyStore, which moves the
+    rect along with them.
+    """
+    layer = LAYER_ENEMIES
+    interpolated = True
+
+    def __init__(self, store, x, y, target, hp_multiplier=1.0, enemy_type=ENEMY_MELEE, room=None):
         super().__init__()
         self.enemy_type = enemy_type
-        self.image = SpriteFactory.create_enemy_sprite(enemy_type, hp_multiplier)
+        self.room = room # Room it sleeps in while the player is away
+        self.image = SpriteFactory.get_enemy_sprite(enemy_type, hp_multiplier)
         self.rect = self.image.get_rect()
         self.rect.center = (x, y)
         self.target = target
-        
-        # Stats based on type
-        if enemy_type == ENEMY_MELEE:
-            self.speed = MELEE_SPEED
-            self.hp = MELEE_HP_BASE * hp_multiplier
-            self.attack_cooldown = 0
-        elif enemy_type == ENEMY_RANGED:
-            self.speed = RANGED_SPEED
-            self.hp = RANGED_HP_BASE * hp_multiplier
-            self.attack_cooldown = RANGED_COOLDOWN
-            self.attack_range = RANGED_ATTACK_RANGE
-        elif enemy_type == ENEMY_DASHER:
-            self.speed = DASHER_SPEED
-            self.hp = DASHER_HP_BASE * hp_multiplier
-            self.attack_cooldown = 0
-        elif enemy_type == ENEMY_BOMBER:
-            self.speed = BOMBER_SPEED
-            self.hp = BOMBER_HP_BASE * hp_multiplier
-            self.attack_cooldown = 0
-            self.explode_range = BOMBER_EXPLODE_RANGE
+        self.store = store
+        self.slot = store.add(self, self.rect.x, self.rect.y, enemy_type, hp_multiplier)
 
-    def update(self, walls):
-        px, py = self.target.rect.center
-        ex, ey = self.rect.center
-        dist = math.sqrt((px - ex)**2 + (py - ey)**2)
-        angle = math.atan2(py - ey, px - ex)
+    def draw_pos(self, alpha):
+        store, i = self.store, self.slot
+        x0, y0 = store.prev_x[i], store.prev_y[i]
+        return x0 + (store.x[i] - x0) * alpha, y0 + (store.y[i] - y0) * alpha
 
-        if self.enemy_type == ENEMY_MELEE or self.enemy_type == ENEMY_DASHER:
-            # Simple chase
-            dx = math.cos(angle) * self.speed
-            dy = math.sin(angle) * self.speed
-            self.move(dx, dy, walls)
-            
-        elif self.enemy_type == ENEMY_BOMBER:
-             # Chase until close, then explode (handled in Game logic ideally, or here)
-             # Let's just chase here, Game class will check distance for explosion damage
-             dx = math.cos(angle) * self.speed
-             dy = math.sin(angle) * self.speed
-             self.move(dx, dy, walls)
-             
-        elif self.enemy_type == ENEMY_RANGED:
-            # Maintain distance
-            if dist > self.attack_range:
-                # Move closer
-                dx = math.cos(angle) * self.speed
-                dy = math.sin(angle) * self.speed
-                self.move(dx, dy, walls)
-            elif dist < self.attack_range - 50:
-                # Move away if too close (kiting)
-                dx = -math.cos(angle) * self.speed
-                dy = -math.sin(angle) * self.speed
-                self.move(dx, dy, walls)
-            
-            # Update cooldown
-            if self.attack_cooldown > 0:
-                self.attack_cooldown -= 1
-    
-    def move(self, dx, dy, walls):
-        self.rect.x += dx
-        self.collide(walls, 'x')
-        self.rect.y += dy
-        self.collide(walls, 'y')
+    @property
+    def hp(self):
+        return self.store.hp[self.slot]
 
-    def collide(self, walls, direction):
-        hits = pygame.sprite.spritecollide(self, walls, False)
-        if hits:
-            if direction == 'x':
-                if self.rect.centerx < hits[0].rect.centerx: # Moving right
-                    self.rect.right = hits[0].rect.left
-                else: # Moving left
-                    self.rect.left = hits[0].rect.right
-            if direction == 'y':
-                if self.rect.centery < hits[0].rect.centery: # Moving down
-                    self.rect.bottom = hits[0].rect.top
-                else: # Moving up
-                    self.rect.top = hits[0].rect.bottom
+    @hp.setter
+    def hp(self, value):
+        self.store.hp[self.slot] = value
 
-    def shoot(self):
-        if self.enemy_type == ENEMY_RANGED and self.attack_cooldown <= 0:
-            self.attack_cooldown = RANGED_COOLDOWN
-            # Aim at player
-            px, py = self.target.rect.center
-            ex, ey = self.rect.center
-            angle = math.atan2(py - ey, px - ex)
-            return EnemyBullet(ex, ey, angle)
-        return None
+    @property
+    def speed(self):
+        return self.store.speed[self.slot]
+
+    @speed.setter
+    def speed(self, value):
+        self.store.speed[self.slot] = value
+
+    def kill(self):
+        super().kill()
+        self.store.release(self.slot)
 
 class Portal(pygame.sprite.Sprite):
+    layer = LAYER_PORTAL
+    interpolated = False
+
     def __init__(self, x, y):
         super().__init__()
-        self.image = SpriteFactory.create_portal_sprite()
+        self.image = SpriteFactory.get_portal_sprite()
         self.rect = self.image.get_rect()
         self.rect.center = (x, y)
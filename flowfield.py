@@ -0,0 +1,88 @@
+from collections import deque
+import numpy as np
+from config import *
+
+# Neighbour offsets, orthogonal first so ties prefer straight steps
+DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+class FlowField:
+    """
+    Breadth-first distances from the player's tile over the walkable grid,
+    shared by every enemy. Steps are 8-way but never cut a wall corner.
+    Each tile stores the neighbour one step closer to the player, so an
+    enemy's next step is a single array lookup. Rebuilt only when the
+    player enters a new tile, and only out to FLOW_FIELD_RADIUS steps.
+    """
+    def __init__(self, collider):
+        self.tile_size = collider.tile_size
+        self.passable = ~collider.solid
+        h, w = self.passable.shape
+        self.width = w
+        self.height = h
+        self.dist = np.full((h, w), -1, dtype=np.int32) # -1 = unreached
+        self.step_x = np.zeros((h, w), dtype=np.int8)
+        self.step_y = np.zeros((h, w), dtype=np.int8)
+        self.origin = None
+
+        # Walkable neighbours of every walkable cell as (flat index, dx, dy)
+        # of the step back from the neighbour to the cell
+        open_cells = self.passable.tolist()
+        def walkable(x, y):
+            return 0 <= x < w and 0 <= y < h and open_cells[y][x]
+        self.neighbours = [()] * (w * h)
+        for y in range(h):
+            for x in range(w):
+                if not open_cells[y][x]:
+                    continue
+                links = []
+                for dx, dy in DIRECTIONS:
+                    if not walkable(x + dx, y + dy):
+                        continue
+                    if dx and dy and not (walkable(x + dx, y) and walkable(x, y + dy)):
+                        continue
+                    links.append(((y + dy) * w + x + dx, -dx, -dy))
+                self.neighbours[y * w + x] = tuple(links)
+
+    def update(self, target):
+        # Returns True when the field was rebuilt
+        ts = self.tile_size
+        tile = (target.rect.centerx // ts, target.rect.centery // ts)
+        if tile == self.origin:
+            return False
+        self.origin = tile
+        self.build(*tile)
+        return True
+
+    def build(self, tx, ty):
+        w, h = self.width, self.height
+        size = w * h
+        dist = [-1] * size
+        step_x = [0] * size
+        step_y = [0] * size
+        if 0 <= tx < w and 0 <= ty < h and self.passable[ty, tx]:
+            start = ty * w + tx
+            dist[start] = 0
+            queue = deque((start,))
+            neighbours = self.neighbours
+            # Each cell found is pointed back at the cell it was reached from,
+            # which is one step closer to the player
+            while queue:
+                cell = queue.popleft()
+                d = dist[cell] + 1
+                if d > FLOW_FIELD_RADIUS:
+                    break
+                for other, dx, dy in neighbours[cell]:
+                    if dist[other] < 0:
+                        dist[other] = d
+                        step_x[other] = dx
+                        step_y[other] = dy
+                        queue.append(other)
+        self.dist[:] = np.array(dist, dtype=np.int32).reshape(h, w)
+        self.step_x[:] = np.array(step_x, dtype=np.int8).reshape(h, w)
+        self.step_y[:] = np.array(step_y, dtype=np.int8).reshape(h, w)
+
+    def lookup(self, tx, ty):
+        # Distance and next step for arrays of tile indices
+        tx = np.clip(tx, 0, self.width - 1)
+        ty = np.clip(ty, 0, self.height - 1)
+        return self.dist[ty, tx], self.step_x[ty, tx], self.step_y[ty, tx]
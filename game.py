@@ -2,16 +2,32 @@ import pygame
 import random
 from config import *
 from entities import Player, Enemy, Portal
-from weapons import Bullet
-from dungeon import DungeonGenerator, Wall
+from dungeon import DungeonGenerator
+from tilegrid import TileGrid, WALL
+from tilemap import TileMap
+from collision import TileCollider
+from spatial import SpatialHash, CollisionStats
+from activation import EnemyActivation
+from enemy_store import EnemyStore
+from flowfield import FlowField
+from sight import LineOfSight
+from projectiles import ProjectileSystem, OWNER_PLAYER, OWNER_ENEMY
+from hud import Hud, ScreenLayer, ProfilerOverlay, render_text
+from render import SoftwareRenderer, RenderPipeline
 from localization import get_text, TEXTS
 from ui_touch import VirtualJoystick, TouchButton
+from input_source import PygameInput
+from profiler import Profiler
+from timestep import FixedTimestep
+import text_cache
 
 class Camera:
     def __init__(self, width, height):
         self.camera = pygame.Rect(0, 0, width, height)
         self.width = width
         self.height = height
+        self.prev_topleft = None # Offset one simulation step ago
+        self.draw_offset = self.camera.topleft # Offset the current frame is drawn with
 
     def apply(self, entity):
         return entity.rect.move(self.camera.topleft)
@@ -19,6 +35,15 @@ class Camera:
     def apply_rect(self, rect):
         return rect.move(self.camera.topleft)
 
+    def view_rect(self):
+        # Visible area in world coordinates
+        return pygame.Rect(-self.draw_offset[0], -self.draw_offset[1], SCREEN_WIDTH, SCREEN_HEIGHT)
+
+    def interpolate(self, alpha):
+        # Draw alpha of the way from the previous step's offset to the current one
+        (x0, y0), (x1, y1) = self.prev_topleft or self.camera.topleft, self.camera.topleft
+        self.draw_offset = (round(x0 + (x1 - x0) * alpha), round(y0 + (y1 - y0) * alpha))
+
     def update(self, target):
         x = -target.rect.centerx + int(SCREEN_WIDTH / 2)
         y = -target.rect.centery + int(SCREEN_HEIGHT / 2)
@@ -29,12 +54,32 @@ class Camera:
         x = max(-(self.width - SCREEN_WIDTH), x)  # right
         y = max(-(self.height - SCREEN_HEIGHT), y)  # bottom
 
+        # The first update snaps instead of sliding in from the corner
+        self.prev_topleft = self.camera.topleft if self.prev_topleft is not None else (x, y)
         self.camera = pygame.Rect(x, y, self.width, self.height)
+        self.draw_offset = self.camera.topleft
 
 class Game:
-    def __init__(self, screen):
+    def __init__(self, screen, renderer=None, input_source=None, seed=None):
         self.screen = screen
+        # Everything is drawn through the renderer backend (see render.py)
+        self.renderer = renderer or SoftwareRenderer(screen)
+        # Keyboard and mouse state, live from pygame unless injected
+        self.input = input_source or PygameInput()
+        # All randomness of the session comes from one seeded RNG, so a seed
+        # plus recorded input (see replay.py) reproduces it exactly
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.recorder = None
+        # Section timings, off unless the overlay is shown (F3 / three fingers)
+        self.profiler = Profiler(PROFILER_OVERLAY)
+        self.profiler_overlay = ProfilerOverlay(self.profiler, self.stats)
+        if CAPTURE_AT_START:
+            self.profiler.start_capture(CAPTURE_AT_START)
+        self.fingers = set()
         self.clock = pygame.time.Clock()
+        # Steps to run per rendered frame, driven by main.py
+        self.timestep = FixedTimestep()
         self.running = True
         self.state = "MENU" # MENU, PLAYING, GAMEOVER, TUTORIAL
         self.lang = "en"
@@ -46,6 +91,23 @@ class Game:
         # Fonts
         self.load_fonts()
         
+        self.pipeline = RenderPipeline()
+        self.tilemap = None # Its chunk surfaces are reused by the next level's
+        
+        # Every bullet and slash in flight, player's and enemies'
+        self.projectiles = ProjectileSystem()
+        
+        # Collision broadphase, rebuilt every frame
+        self.collision_stats = CollisionStats()
+        self.enemy_hash = SpatialHash(COLLISION_CELL_SIZE, self.collision_stats)
+        self.portal_hash = SpatialHash(COLLISION_CELL_SIZE, self.collision_stats)
+        
+        # Cached HUD and static screens
+        self.hud = Hud(self)
+        self.menu_screen = ScreenLayer(self.menu_lines)
+        self.gameover_screen = ScreenLayer(self.gameover_lines)
+        self.shown_state = None
+        
         # Touch Controls
         self.touch_active = True # Default enabled for testing
         self.joystick_left = VirtualJoystick(100, SCREEN_HEIGHT - 100, 60, 30)
@@ -66,6 +128,9 @@ class Game:
         if self.player: self.player.switch_weapon()
 
     def load_fonts(self):
+        # Cached text is keyed on the fonts, so entries of an earlier Game
+        # are dead; starting empty also makes its counters cover this run
+        text_cache.text_cache.clear()
         # Use system font for Chinese support
         # "simhei" is common on Windows for Simplified Chinese
         # "arial" or "microsoftyahei" might also work
@@ -96,32 +161,30 @@ class Game:
         self.tutorial_step = 1
         self.tutorial_timer = 0
         self.new_level(is_tutorial=True)
-        self.player.rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+        self.player.set_center(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
         
     def new_level(self, is_tutorial=False):
+        self.on_tutorial_level = is_tutorial
         # Sprite Groups
         self.all_sprites = pygame.sprite.Group()
-        self.walls = pygame.sprite.Group()
         self.enemies = pygame.sprite.Group()
-        self.bullets = pygame.sprite.Group()
-        self.enemy_bullets = pygame.sprite.Group()
+        self.enemy_store = EnemyStore()
+        self.projectiles.clear()
         self.portals = pygame.sprite.Group()
         
         if is_tutorial:
             # Create a simple box room for tutorial
-            self.walls.add(Wall(0, 0)) # Placeholder
             # Build a simple 20x15 room
-            for x in range(20):
-                self.walls.add(Wall(x, 0))
-                self.walls.add(Wall(x, 14))
-            for y in range(15):
-                self.walls.add(Wall(0, y))
-                self.walls.add(Wall(19, y))
+            self.grid = TileGrid(20, 15, WALL)
+            self.grid.carve(1, 1, 18, 13)
+            self.grid.freeze()
             
-            self.all_sprites.add(self.walls)
+            self.collider = TileCollider(self.grid)
+            self.tilemap = TileMap(self.grid, {"wall": DARK_GRAY, "floor": BLACK}, recycle=self.tilemap, renderer=self.renderer)
+            self.activation = EnemyActivation([], stats=self.collision_stats)
             
             # Player Spawn
-            self.player = Player(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+            self.player = Player(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, input_source=self.input, rng=self.rng)
             self.all_sprites.add(self.player)
             
             # Camera centered
@@ -133,10 +196,15 @@ class Game:
             return
 
         # Dungeon Generation
-        self.dungeon_gen = DungeonGenerator()
-        grid, rooms = self.dungeon_gen.generate()
-        self.walls = self.dungeon_gen.build_walls(self.current_theme["wall"])
-        self.all_sprites.add(self.walls)
+        with self.profiler.section("generate"):
+            self.dungeon_gen = DungeonGenerator(self.rng)
+            self.grid, rooms = self.dungeon_gen.generate()
+        with self.profiler.section("level_build"):
+            self.collider = TileCollider(self.grid)
+            self.tilemap = TileMap(self.grid, self.current_theme, recycle=self.tilemap, renderer=self.renderer)
+            self.activation = EnemyActivation(rooms, stats=self.collision_stats)
+            self.flow_field = FlowField(self.collider)
+            self.sight = LineOfSight(self.collider)
         
         # Player Spawn (Center of first room)
         start_room = rooms[0]
@@ -144,10 +212,10 @@ class Game:
         player_y = start_room.center[1] * TILE_SIZE
         
         if self.player is None:
-            self.player = Player(player_x, player_y)
+            self.player = Player(player_x, player_y, input_source=self.input, rng=self.rng)
         else:
             # Preserve stats but reset position
-            self.player.rect.center = (player_x, player_y)
+            self.player.set_center(player_x, player_y)
             # Add back to group
             
         self.all_sprites.add(self.player)
@@ -157,6 +225,7 @@ class Game:
         portal = Portal(end_room.center[0] * TILE_SIZE, end_room.center[1] * TILE_SIZE)
         self.all_sprites.add(portal)
         self.portals.add(portal)
+        self.portal_hash.rebuild(self.portals)
         
         # Camera
         self.camera = Camera(MAP_WIDTH * TILE_SIZE, MAP_HEIGHT * TILE_SIZE)
@@ -169,14 +238,14 @@ class Game:
         for i in range(1, len(rooms)):
             room = rooms[i]
             # Number of enemies per room scales with level
-            num_enemies = random.randint(1, 2 + int(self.level * 0.5))
+            num_enemies = self.rng.randint(1, 2 + int(self.level * 0.5))
             for _ in range(num_enemies):
                 self.spawn_enemy_in_room(room)
 
     def spawn_enemy_in_room(self, room):
         # Pick random spot in room
-        x = random.randint(room.rect.x + 1, room.rect.x + room.rect.w - 2) * TILE_SIZE
-        y = random.randint(room.rect.y + 1, room.rect.y + room.rect.h - 2) * TILE_SIZE
+        x = self.rng.randint(room.rect.x + 1, room.rect.x + room.rect.w - 2) * TILE_SIZE
+        y = self.rng.randint(room.rect.y + 1, room.rect.y + room.rect.h - 2) * TILE_SIZE
         
         # Don't spawn too close to player (just in case)
         dist = ((x - self.player.rect.centerx)**2 + (y - self.player.rect.centery)**2)**0.5
@@ -184,7 +253,7 @@ class Game:
             return
 
         # Randomly choose type based on level
-        r = random.random()
+        r = self.rng.random()
         enemy_type = ENEMY_MELEE
         
         # Level 1: Mostly Melee, rare Ranged
@@ -201,11 +270,35 @@ class Game:
         else:
             if r < 0.2: enemy_type = ENEMY_RANGED
 
-        enemy = Enemy(x, y, self.player, self.difficulty_multiplier, enemy_type)
+        enemy = Enemy(self.enemy_store, x, y, self.player, self.difficulty_multiplier, enemy_type, room)
         self.all_sprites.add(enemy)
         self.enemies.add(enemy)
-
-    def handle_input(self, event):
+        self.activation.add(enemy)
+
+    def handle_input(self, event, logical=False):
+        # Pointer positions in logical screen coordinates at any render scale,
+        # unless the event already is (replayed input)
+        if not logical:
+            event = self.renderer.map_event(event)
+        if self.recorder:
+            self.recorder.event(event, self.input)
+        
+        # Profiler overlay toggle and frame capture
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            self.profiler_overlay.toggle()
+            return
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+            self.profiler.start_capture()
+            return
+        if event.type == pygame.FINGERDOWN:
+            self.fingers.add(event.finger_id)
+            if len(self.fingers) == 3:
+                self.profiler_overlay.toggle()
+            elif len(self.fingers) == 4:
+                self.profiler.start_capture()
+        elif event.type == pygame.FINGERUP:
+            self.fingers.discard(event.finger_id)
+        
         # Handle Touch Input
         if self.touch_active:
             if self.joystick_left.handle_event(event): return
@@ -222,6 +315,9 @@ class Game:
             
             if self.state == "MENU":
                 if event.key == pygame.K_RETURN:
+                    # Coming back from the tutorial needs a real dungeon
+                    if self.on_tutorial_level:
+                        self.start_game()
                     self.state = "PLAYING"
                 if event.key == pygame.K_t:
                     self.start_tutorial()
@@ -252,21 +348,19 @@ class Game:
             if self.state == "PLAYING" or self.state == "TUTORIAL":
                 if event.button == 1:  # Left click
                     # Adjust mouse position for camera
-                    mx, my = pygame.mouse.get_pos()
+                    mx, my = event.pos
                     cx, cy = self.camera.camera.topleft
                     target_pos = (mx - cx, my - cy)
                     
-                    bullets = self.player.shoot_at(target_pos)
-                    if bullets:
-                        for b in bullets:
-                            self.all_sprites.add(b)
-                            self.bullets.add(b)
-                        
+                    if self.player.shoot_at(self.projectiles, target_pos):
                         if self.state == "TUTORIAL" and self.tutorial_step == 2:
                             self.tutorial_step = 3
                             self.tutorial_timer = 0
 
     def update(self):
+        if self.recorder:
+            self.recorder.step(self.input)
+        
         if self.state == "TUTORIAL":
             # Simple update for tutorial
             self.camera.update(self.player)
@@ -275,33 +369,30 @@ class Game:
             if self.touch_active:
                 move_vec = self.joystick_left.value
                 aim_vec = self.joystick_right.value
-                self.player.update(self.walls, move_vec, aim_vec)
+                self.player.update(self.collider, move_vec, aim_vec)
                 
                 # Check for shooting
                 if self.joystick_right.active and (abs(aim_vec[0]) > 0.1 or abs(aim_vec[1]) > 0.1):
                     # Auto shoot when aiming
-                    bullets = self.player.shoot_dir(aim_vec)
-                    if bullets:
-                        for b in bullets:
-                            self.all_sprites.add(b)
-                            self.bullets.add(b)
+                    if self.player.shoot_dir(self.projectiles, aim_vec):
                         if self.tutorial_step == 2:
                             self.tutorial_step = 3
                             self.tutorial_timer = 0
             else:
-                self.player.update(self.walls)
+                self.player.update(self.collider)
                 
-            self.bullets.update()
-            self.enemy_bullets.update()
+            with self.profiler.section("projectiles"):
+                self.projectiles.step(self.collider)
             if self.dummy_enemy:
-                self.dummy_enemy.update(self.walls)
+                with self.profiler.section("enemies"):
+                    self.enemy_store.update(self.collider, self.player, self.enemies)
             
             # Tutorial Logic
             self.tutorial_timer += 1
             
             # Step 1: Move
             if self.tutorial_step == 1:
-                keys = pygame.key.get_pressed()
+                keys = self.input.keys()
                 moved = False
                 if keys[pygame.K_w] or keys[pygame.K_a] or keys[pygame.K_s] or keys[pygame.K_d]:
                     moved = True
@@ -323,17 +414,17 @@ class Game:
             if self.tutorial_step == 5:
                 if not self.dummy_enemy:
                     # Spawn dummy
-                    self.dummy_enemy = Enemy(SCREEN_WIDTH // 2 + 200, SCREEN_HEIGHT // 2, self.player, enemy_type=ENEMY_MELEE)
+                    self.dummy_enemy = Enemy(self.enemy_store, SCREEN_WIDTH // 2 + 200, SCREEN_HEIGHT // 2, self.player, enemy_type=ENEMY_MELEE)
                     self.dummy_enemy.speed = 0 # Stationary
                     self.all_sprites.add(self.dummy_enemy)
                     self.enemies.add(self.dummy_enemy)
                 
                 # Check collision
-                pygame.sprite.groupcollide(self.bullets, self.walls, True, False)
-                hits = pygame.sprite.groupcollide(self.enemies, self.bullets, False, True)
-                for enemy, bullets_hit in hits.items():
-                    for bullet in bullets_hit:
-                        enemy.hp -= bullet.damage
+                self.collision_stats.reset()
+                hits = self.projectiles.collide_sprites(self.enemies, OWNER_PLAYER, self.collision_stats)
+                for enemy, damages in hits.items():
+                    for damage in damages:
+                        enemy.hp -= damage
                         if enemy.hp <= 0:
                             enemy.kill()
                             self.dummy_enemy = None
@@ -350,78 +441,88 @@ class Game:
             self.camera.update(self.player)
             
             # Update all sprites
-            if self.touch_active:
-                move_vec = self.joystick_left.value
-                aim_vec = self.joystick_right.value
-                self.player.update(self.walls, move_vec, aim_vec)
-                
-                if self.joystick_right.active and (abs(aim_vec[0]) > 0.1 or abs(aim_vec[1]) > 0.1):
-                    bullets = self.player.shoot_dir(aim_vec)
-                    if bullets:
-                        for b in bullets:
-                            self.all_sprites.add(b)
-                            self.bullets.add(b)
-            else:
-                self.player.update(self.walls)
+            with self.profiler.section("player"):
+                if self.touch_active:
+                    move_vec = self.joystick_left.value
+                    aim_vec = self.joystick_right.value
+                    self.player.update(self.collider, move_vec, aim_vec)
+                    
+                    if self.joystick_right.active and (abs(aim_vec[0]) > 0.1 or abs(aim_vec[1]) > 0.1):
+                        self.player.shoot_dir(self.projectiles, aim_vec)
+                else:
+                    self.player.update(self.collider)
                 
-            self.enemies.update(self.walls)
-            self.bullets.update()
-            self.enemy_bullets.update()
+            # Only enemies near the player think and move
+            with self.profiler.section("enemies"):
+                self.activation.update(self.player)
+                self.flow_field.update(self.player)
+                self.enemy_store.update(self.collider, self.player, self.activation.active, self.flow_field)
+            # Move, expire and wall-test every projectile in one step
+            with self.profiler.section("projectiles"):
+                self.projectiles.step(self.collider)
             
             # Enemy Logic (Shoot)
-            for enemy in self.enemies:
-                bullet = enemy.shoot()
-                if bullet:
-                    self.all_sprites.add(bullet)
-                    self.enemy_bullets.add(bullet)
+            with self.profiler.section("enemies"):
+                self.enemy_store.fire(self.projectiles, self.player, self.activation.active, self.sight)
             
             # Enemy Spawning (Continuous)
             self.spawn_timer += 1
             if self.spawn_timer >= ENEMY_SPAWN_RATE / self.difficulty_multiplier: # Faster spawn on higher levels
                 self.spawn_timer = 0
-                self.spawn_random_enemy()
+                with self.profiler.section("spawning"):
+                    self.spawn_random_enemy()
                 
-            # Collision: Bullet vs Enemy
-            hits = pygame.sprite.groupcollide(self.enemies, self.bullets, False, True)
-            for enemy, bullets_hit in hits.items():
-                for bullet in bullets_hit:
-                    enemy.hp -= bullet.damage
-                    if enemy.hp <= 0:
-                        enemy.kill()
-                        self.score += 10
-                        break 
+            with self.profiler.section("collision"):
+                # Broadphase: bucket the awake enemies once for the pair
+                # queries below, sleeping ones stay in their own hash
+                self.collision_stats.reset()
+                self.enemy_hash.rebuild(self.activation.active)
+                enemy_hashes = (self.enemy_hash, self.activation.sleeping_hash)
+            
+                # Collision: Bullet vs Enemy
+                with self.profiler.section("bullets_enemies"):
+                    for enemy_hash in enemy_hashes:
+                        hits = self.projectiles.collide_hash(enemy_hash, OWNER_PLAYER)
+                        for enemy, damages in hits.items():
+                            # Getting shot wakes a sleeping enemy
+                            self.activation.wake(enemy)
+                            for damage in damages:
+                                enemy.hp -= damage
+                                if enemy.hp <= 0:
+                                    enemy.kill()
+                                    self.score += 10
+                                    break 
                 
-            # Collision: Bullet vs Wall
-            pygame.sprite.groupcollide(self.bullets, self.walls, True, False)
-            pygame.sprite.groupcollide(self.enemy_bullets, self.walls, True, False)
-
-            # Collision: Player vs Enemy
-            hits = pygame.sprite.spritecollide(self.player, self.enemies, False)
-            if hits:
-                self.player.hp -= 1
-                if self.player.hp <= 0:
-                    self.state = "GAMEOVER"
+                # Collision: Player vs Enemy
+                with self.profiler.section("player_enemies"):
+                    hits = [enemy for enemy_hash in enemy_hashes for enemy in enemy_hash.collide_sprite(self.player)]
+                    if hits:
+                        self.player.hp -= 1
+                        if self.player.hp <= 0:
+                            self.state = "GAMEOVER"
             
-            # Collision: Player vs Enemy Bullet
-            hits = pygame.sprite.spritecollide(self.player, self.enemy_bullets, True)
-            if hits:
-                self.player.hp -= 5 # Bullet damage
-                if self.player.hp <= 0:
-                    self.state = "GAMEOVER"
+                # Collision: Player vs Enemy Bullet
+                with self.profiler.section("player_bullets"):
+                    hits = self.projectiles.collide_sprites([self.player], OWNER_ENEMY, self.collision_stats)
+                    if hits:
+                        self.player.hp -= ENEMY_BULLET_DAMAGE
+                        if self.player.hp <= 0:
+                            self.state = "GAMEOVER"
 
             # Collision: Player vs Portal
-            hits = pygame.sprite.spritecollide(self.player, self.portals, False)
+            hits = self.portal_hash.collide_sprite(self.player)
             if hits:
                 self.next_level()
 
     def next_level(self):
-        self.level += 1
-        self.difficulty_multiplier += 0.2
-        # Pick new theme
-        self.current_theme = random.choice(THEMES)
-        self.new_level()
-        # Heal player slightly?
-        self.player.hp = min(PLAYER_START_HP, self.player.hp + 20)
+        with self.profiler.section("next_level"):
+            self.level += 1
+            self.difficulty_multiplier += 0.2
+            # Pick new theme
+            self.current_theme = self.rng.choice(THEMES)
+            self.new_level()
+            # Heal player slightly?
+            self.player.hp = min(PLAYER_START_HP, self.player.hp + 20)
 
     def spawn_random_enemy(self):
         # Spawn in a random room except the one player is in
@@ -429,14 +530,14 @@ class Game:
         
         # Try a few times to find a valid spot
         for _ in range(5):
-            room = random.choice(self.dungeon_gen.rooms)
-            x = random.randint(room.rect.x + 1, room.rect.x + room.rect.w - 2) * TILE_SIZE
-            y = random.randint(room.rect.y + 1, room.rect.y + room.rect.h - 2) * TILE_SIZE
+            room = self.rng.choice(self.dungeon_gen.rooms)
+            x = self.rng.randint(room.rect.x + 1, room.rect.x + room.rect.w - 2) * TILE_SIZE
+            y = self.rng.randint(room.rect.y + 1, room.rect.y + room.rect.h - 2) * TILE_SIZE
             
             # Don't spawn too close to player
             dist = ((x - self.player.rect.centerx)**2 + (y - self.player.rect.centery)**2)**0.5
             if dist > 400: # Spawn far away so player doesn't see it pop in
-                r = random.random()
+                r = self.rng.random()
                 enemy_type = ENEMY_MELEE
                 
                 if self.level >= 5:
@@ -449,121 +550,142 @@ class Game:
                 else:
                     if r < 0.2: enemy_type = ENEMY_RANGED
                 
-                enemy = Enemy(x, y, self.player, self.difficulty_multiplier, enemy_type)
+                enemy = Enemy(self.enemy_store, x, y, self.player, self.difficulty_multiplier, enemy_type, room)
                 self.all_sprites.add(enemy)
                 self.enemies.add(enemy)
+                self.activation.add(enemy)
                 break
 
-    def draw(self):
-        self.screen.fill(BLACK)
-        
+    def draw(self, alpha=1.0):
+        # Returns the dirty rects to present, or None for a full flip. alpha
+        # places moving things between the last two simulation steps.
         if self.state == "MENU":
-            self.draw_text(get_text("title", self.lang), self.font_large, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3)
-            self.draw_text(get_text("menu_start", self.lang), self.font_medium, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
-            self.draw_text(get_text("menu_tutorial", self.lang), self.font_medium, GREEN, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50)
-            self.draw_text(get_text("menu_restart", self.lang), self.font_medium, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 100)
-            self.draw_text(get_text("menu_lang", self.lang), self.font_medium, YELLOW, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 150)
+            self.menu_screen.update(self.lang)
+            return self.draw_static_screen(self.menu_screen)
             
-        elif self.state == "TUTORIAL":
+        elif self.state == "GAMEOVER":
+            self.gameover_screen.update((self.lang, self.score, self.level))
+            return self.draw_static_screen(self.gameover_screen)
+
+        self.shown_state = self.state
+        self.renderer.begin_frame(BLACK)
+        
+        profiler = self.profiler
+        if self.state == "TUTORIAL":
             # Draw Map and Sprites with Camera
-            for sprite in self.all_sprites:
-                self.screen.blit(sprite.image, self.camera.apply(sprite))
+            with profiler.section("world"):
+                self.draw_world(alpha)
             
             # Tutorial Instructions
-            self.draw_tutorial_hud()
+            with profiler.section("hud"):
+                self.draw_tutorial_hud()
             
             # Touch Controls
             if self.touch_active:
-                self.joystick_left.draw(self.screen)
-                self.joystick_right.draw(self.screen)
-                self.btn_skill.draw(self.screen, self.font_small)
-                self.btn_switch.draw(self.screen, self.font_small)
+                with profiler.section("touch"):
+                    self.draw_touch_controls()
             
         elif self.state == "PLAYING":
             # Draw Map and Sprites with Camera
-            for sprite in self.all_sprites:
-                self.screen.blit(sprite.image, self.camera.apply(sprite))
+            with profiler.section("world"):
+                self.draw_world(alpha)
                 
             # Draw HUD
-            self.draw_hud()
+            with profiler.section("hud"):
+                self.draw_hud()
             
             # Touch Controls
             if self.touch_active:
-                self.joystick_left.draw(self.screen)
-                self.joystick_right.draw(self.screen)
-                self.btn_skill.draw(self.screen, self.font_small)
-                self.btn_switch.draw(self.screen, self.font_small)
-            
-        elif self.state == "GAMEOVER":
-            self.draw_text(get_text("game_over", self.lang), self.font_large, RED, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3)
-            self.draw_text(get_text("score", self.lang, self.score), self.font_medium, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
-            self.draw_text(get_text("level_reached", self.lang, self.level), self.font_medium, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50)
-            self.draw_text(get_text("restart_prompt", self.lang), self.font_medium, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 100)
+                with profiler.section("touch"):
+                    self.draw_touch_controls()
+        
+        # Over the world only, static screens aren't redrawn every frame
+        self.profiler_overlay.draw(self.renderer)
+        return None
+
+    def stats(self):
+        # {group: {counter: value}} shown by the profiler overlay and
+        # written by benchmark.py
+        return {
+            "projectiles": self.projectiles.pool_stats(),
+            "text_cache": text_cache.text_cache.stats(),
+            "collision": self.collision_stats.as_dict(), # Latest frame
+            "enemies": self.activation.counts(),
+            "sight": self.sight.stats(),
+            "timestep": self.timestep.stats(),
+        }
+
+    def draw_touch_controls(self):
+        self.joystick_left.draw(self.renderer)
+        self.joystick_right.draw(self.renderer)
+        self.btn_skill.draw(self.renderer, self.font_small)
+        self.btn_switch.draw(self.renderer, self.font_small)
+
+    def draw_static_screen(self, layer):
+        # A static page goes out whole on the first frame after a state
+        # change, after that only when its content changed
+        if self.state != self.shown_state:
+            self.shown_state = self.state
+            layer.draw(self.renderer)
+            return [self.renderer.get_rect()]
+        if layer.dirty_rect is None:
+            return []
+        return [layer.draw(self.renderer)]
+
+    def menu_lines(self, lang):
+        return [
+            (get_text("title", lang), self.font_large, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3),
+            (get_text("menu_start", lang), self.font_medium, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2),
+            (get_text("menu_tutorial", lang), self.font_medium, GREEN, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50),
+            (get_text("menu_restart", lang), self.font_medium, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 100),
+            (get_text("menu_lang", lang), self.font_medium, YELLOW, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 150),
+        ]
+
+    def gameover_lines(self, key):
+        lang, score, level = key
+        return [
+            (get_text("game_over", lang), self.font_large, RED, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3),
+            (get_text("score", lang, score), self.font_medium, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2),
+            (get_text("level_reached", lang, level), self.font_medium, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50),
+            (get_text("restart_prompt", lang), self.font_medium, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 100),
+        ]
+
+    def draw_world(self, alpha=1.0):
+        # Map chunks and visible sprites, batched per draw layer
+        self.camera.interpolate(alpha)
+        self.tilemap.queue(self.pipeline, self.camera)
+        self.pipeline.add_sprites(self.visible_sprites(), self.camera.draw_offset, alpha)
+        self.projectiles.queue(self.pipeline, self.camera, alpha)
+        self.pipeline.submit(self.renderer)
+
+    def visible_sprites(self):
+        # Only sprites intersecting the camera view get blitted. One rect
+        # test each in C is cheaper than keeping a hash of moving sprites.
+        sprites = self.all_sprites.sprites()
+        hits = self.camera.view_rect().collidelistall([sprite.rect for sprite in sprites])
+        return [sprites[i] for i in hits]
 
     def draw_tutorial_hud(self):
-        text = ""
+        text_key = None
         if self.tutorial_step == 1:
-            text = get_text("tut_move", self.lang)
+            text_key = "tut_move"
         elif self.tutorial_step == 2:
-            text = get_text("tut_shoot", self.lang)
+            text_key = "tut_shoot"
         elif self.tutorial_step == 3:
-            text = get_text("tut_switch", self.lang)
+            text_key = "tut_switch"
         elif self.tutorial_step == 4:
-            text = get_text("tut_skill", self.lang)
+            text_key = "tut_skill"
         elif self.tutorial_step == 5:
-            text = get_text("tut_dummy", self.lang)
+            text_key = "tut_dummy"
         elif self.tutorial_step == 6:
-            text = get_text("tut_complete", self.lang)
+            text_key = "tut_complete"
             
-        # Draw text at top
-        self.draw_text(text, self.font_medium, WHITE, SCREEN_WIDTH // 2, 50)
-        
-        # Show HUD elements for context
-        self.draw_hud()
+        # Draw text at top, with HUD elements for context
+        return self.hud.draw_tutorial(self.renderer, text_key)
 
     def draw_hud(self):
-        # HP Bar
-        bar_width = 200
-        bar_height = 20
-        fill = (self.player.hp / PLAYER_START_HP) * bar_width
-        outline_rect = pygame.Rect(10, 10, bar_width, bar_height)
-        fill_rect = pygame.Rect(10, 10, fill, bar_height)
-        pygame.draw.rect(self.screen, GREEN, fill_rect)
-        pygame.draw.rect(self.screen, WHITE, outline_rect, 2)
-        
-        # Weapon Info
-        w_name = self.player.weapon.name
-        # Map weapon name to localized string key
-        w_key = "weapon_" + w_name.lower()
-        w_name_loc = get_text(w_key, self.lang)
-        
-        weapon_text = get_text("weapon", self.lang, w_name_loc)
-        self.draw_text(weapon_text, self.font_small, WHITE, 100, 50, align="left")
-        
-        # Skill Info
-        skill_text = get_text("skill_ready", self.lang)
-        skill_color = CYAN
-        if self.player.skill_cooldown > 0:
-            skill_text = get_text("skill_cooldown", self.lang, int(self.player.skill_cooldown / 60))
-            skill_color = GRAY
-        self.draw_text(skill_text, self.font_small, skill_color, 100, 80, align="left")
-        
-        # Score & Level
-        score_text = get_text("score", self.lang, self.score)
-        self.draw_text(score_text, self.font_small, WHITE, SCREEN_WIDTH - 100, 20)
-        
-        level_text = get_text("level", self.lang, self.level)
-        self.draw_text(level_text, self.font_small, YELLOW, SCREEN_WIDTH // 2, 20)
+        return self.hud.draw(self.renderer)
 
     def draw_text(self, text, font, color, x, y, align="center"):
-        text_surface = font.render(text, True, color)
-        text_rect = text_surface.get_rect()
-        if align == "center":
-            text_rect.center = (x, y)
-        elif align == "left":
-            text_rect.topleft = (x, y) # This might need adjustment based on how I call it
-            # Actually let's just center it for now or use top-left
-            text_rect.center = (x, y) # Simplified
-        elif align == "right":
-            text_rect.topright = (x, y)
-        self.screen.blit(text_surface, text_rect)
+        text_surface, text_rect = render_text(font, text, color, x, y, align)
+        self.renderer.blit(text_surface, text_rect)
@@ -0,0 +1,91 @@
+"""
+Run the game without a window.
+
+    python headless.py [steps] [--draw]
+
+Uses SDL's dummy video driver unless SDL_VIDEODRIVER is already set, and
+feeds Game from a ScriptedInput instead of the keyboard and mouse.
+"""
+import os
+import sys
+import json
+import time
+
+def init_display():
+    # A real display surface with no window behind it
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    from config import SCREEN_WIDTH, SCREEN_HEIGHT
+    pygame.display.init()
+    pygame.font.init()
+    return pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+class HeadlessRunner:
+    """
+    Steps Game.update directly, handing it the events queued on its input
+    source first. Drawing is skipped unless draw is set. Touch controls are
+    off by default so held keys drive the player.
+    """
+    def __init__(self, input_source=None, draw=False, touch=False, seed=None):
+        screen = init_display()
+        from game import Game
+        from render import SoftwareRenderer
+        from input_source import ScriptedInput
+        self.input = input_source or ScriptedInput()
+        self.game = Game(screen, SoftwareRenderer(screen), self.input, seed)
+        self.game.touch_active = touch
+        # Always timed, step() reports each frame's sections
+        self.game.profiler.set_enabled(True)
+        self.draw = draw
+        self.steps = 0
+        self.last_frame = {} # Section timings of the latest step
+
+    def start(self):
+        # Straight into a new run on level 1, skipping the menu
+        self.game.start_game()
+        self.game.state = "PLAYING"
+
+    def step(self, count=1):
+        # Each step is one profiler frame
+        game = self.game
+        profiler = game.profiler
+        logical = getattr(self.input, "logical", False)
+        for _ in range(count):
+            for event in self.input.events():
+                game.handle_input(event, logical)
+            with profiler.section("update"):
+                game.update()
+            if self.draw:
+                with profiler.section("draw"):
+                    game.draw()
+            self.last_frame = profiler.end_frame()
+            self.steps += 1
+        return game
+
+    def summary(self):
+        game = self.game
+        return {
+            "steps": self.steps,
+            "state": game.state,
+            "level": game.level,
+            "score": game.score,
+            "hp": game.player.hp,
+            "enemies": len(game.enemies),
+            "projectiles": len(game.projectiles),
+        }
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    steps = int(args[0]) if args else 600
+    from config import RUN_SEED
+    runner = HeadlessRunner(draw="--draw" in sys.argv, seed=RUN_SEED)
+    runner.start()
+    start = time.perf_counter()
+    runner.step(steps)
+    result = runner.summary()
+    result["ms_per_step"] = (time.perf_counter() - start) * 1000 / steps
+    print(json.dumps(result))
+
+if __name__ == "__main__":
+    main()
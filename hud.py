@@ -0,0 +1,206 @@
+import pygame
+from config import *
+from localization import get_text
+import text_cache
+
+def align_text_rect(rect, x, y, align="center"):
+    if align == "center":
+        rect.center = (x, y)
+    elif align == "left":
+        # Left-aligned HUD lines are positioned by their center as well
+        rect.center = (x, y)
+    elif align == "right":
+        rect.topright = (x, y)
+    return rect
+
+def render_text(font, text, color, x, y, align="center"):
+    surface = text_cache.render(font, text, color)
+    return surface, align_text_rect(surface.get_rect(), x, y, align)
+
+class CachedLayer:
+    """
+    A panel kept as a cached surface. It is only re-rendered when the key of
+    values it shows changes, and reports the screen area that changed.
+    """
+    def __init__(self, render):
+        self.render = render # key -> (surface, rect)
+        self.key = None
+        self.surface = None
+        self.rect = None
+        self.dirty_rect = None
+
+    def update(self, key):
+        if self.surface is None or key != self.key:
+            old_rect = self.rect
+            self.key = key
+            self.surface, self.rect = self.render(key)
+            # Cover the old content too in case the panel shrank
+            self.dirty_rect = self.rect.union(old_rect) if old_rect else self.rect.copy()
+        return self.dirty_rect is not None
+
+    def draw(self, screen):
+        screen.blit(self.surface, self.rect)
+        dirty = self.dirty_rect
+        self.dirty_rect = None
+        return dirty
+
+class Hud:
+    def __init__(self, game):
+        self.game = game
+        self.hp_layer = CachedLayer(self.render_hp)
+        self.weapon_layer = CachedLayer(self.render_weapon)
+        self.skill_layer = CachedLayer(self.render_skill)
+        self.score_layer = CachedLayer(self.render_score)
+        self.level_layer = CachedLayer(self.render_level)
+        self.tutorial_layer = CachedLayer(self.render_tutorial)
+
+    def render_hp(self, hp):
+        # HP Bar
+        bar_width = 200
+        bar_height = 20
+        fill = max(0, (hp / PLAYER_START_HP) * bar_width)
+        surface = pygame.Surface((bar_width, bar_height), pygame.SRCALPHA)
+        pygame.draw.rect(surface, GREEN, (0, 0, fill, bar_height))
+        pygame.draw.rect(surface, WHITE, (0, 0, bar_width, bar_height), 2)
+        return surface, surface.get_rect(topleft=(10, 10))
+
+    def render_weapon(self, key):
+        lang, w_name = key
+        # Map weapon name to localized string key
+        w_name_loc = get_text("weapon_" + w_name.lower(), lang)
+        return render_text(self.game.font_small, get_text("weapon", lang, w_name_loc), WHITE, 100, 50, align="left")
+
+    def render_skill(self, key):
+        lang, seconds = key
+        if seconds is None:
+            return render_text(self.game.font_small, get_text("skill_ready", lang), CYAN, 100, 80, align="left")
+        return render_text(self.game.font_small, get_text("skill_cooldown", lang, seconds), GRAY, 100, 80, align="left")
+
+    def render_score(self, key):
+        lang, score = key
+        return render_text(self.game.font_small, get_text("score", lang, score), WHITE, SCREEN_WIDTH - 100, 20)
+
+    def render_level(self, key):
+        lang, level = key
+        return render_text(self.game.font_small, get_text("level", lang, level), YELLOW, SCREEN_WIDTH // 2, 20)
+
+    def render_tutorial(self, key):
+        lang, text_key = key
+        text = get_text(text_key, lang) if text_key else ""
+        return render_text(self.game.font_medium, text, WHITE, SCREEN_WIDTH // 2, 50)
+
+    def draw(self, screen):
+        game = self.game
+        player = game.player
+        seconds = int(player.skill_cooldown / 60) if player.skill_cooldown > 0 else None
+        self.hp_layer.update(player.hp)
+        self.weapon_layer.update((game.lang, player.weapon.name))
+        self.skill_layer.update((game.lang, seconds))
+        self.score_layer.update((game.lang, game.score))
+        self.level_layer.update((game.lang, game.level))
+
+        dirty = []
+        for layer in (self.hp_layer, self.weapon_layer, self.skill_layer, self.score_layer, self.level_layer):
+            rect = layer.draw(screen)
+            if rect:
+                dirty.append(rect)
+        return dirty
+
+    def draw_tutorial(self, screen, text_key):
+        self.tutorial_layer.update((self.game.lang, text_key))
+        rect = self.tutorial_layer.draw(screen)
+        dirty = self.draw(screen)
+        if rect:
+            dirty.append(rect)
+        return dirty
+
+class ScreenLayer(CachedLayer):
+    """
+    A full-screen static page (menu, game over). Once presented it needs no
+    redraw at all until its key changes.
+    """
+    def __init__(self, lines):
+        super().__init__(self.render_page)
+        self.lines = lines # key -> [(text, font, color, x, y), ...]
+
+    def render_page(self, key):
+        surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        surface.fill(BLACK)
+        for text, font, color, x, y in self.lines(key):
+            text_surface, text_rect = render_text(font, text, color, x, y)
+            surface.blit(text_surface, text_rect)
+        return surface, surface.get_rect()
+
+def format_counter(value):
+    return f"{value:.2f}" if isinstance(value, float) else str(value)
+
+class ProfilerOverlay:
+    """
+    Section timings from the game's Profiler: min/avg/p99 over the recent
+    history per section, the counters returned by stats() and a graph of
+    frame times. The text is re-rendered every PROFILER_REFRESH frames and
+    the graph every frame.
+    """
+    WIDTH = 280
+    ROW_HEIGHT = 16
+    GRAPH_HEIGHT = 60
+    COLUMNS = (6, 150, 192, 234)
+
+    def __init__(self, profiler, stats=None):
+        self.profiler = profiler
+        self.stats = stats # () -> {group: {counter: value}}
+        self.visible = profiler.enabled
+        self.font = None
+        self.layer = CachedLayer(self.render_stats)
+
+    def toggle(self):
+        # Sections are only timed while shown
+        self.visible = not self.visible
+        self.profiler.set_enabled(self.visible)
+
+    def render_stats(self, key):
+        if self.font is None:
+            self.font = pygame.font.Font(None, 18)
+        profiler = self.profiler
+        rows = [("ms", "min", "avg", "p99")]
+        for name, buffer in [("frame", profiler.frame_times)] + list(profiler.history.items()):
+            stats = buffer.stats()
+            if stats:
+                rows.append((name,) + tuple(f"{value:.2f}" for value in stats))
+        counters = []
+        for group, values in (self.stats() if self.stats else {}).items():
+            text = group + ": " + " ".join(f"{name} {format_counter(value)}" for name, value in values.items())
+            counters.append(text_cache.render(self.font, text, CYAN))
+        width = max([self.WIDTH] + [line.get_width() + 12 for line in counters])
+        height = (len(rows) + len(counters)) * self.ROW_HEIGHT + 6
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 170))
+        for i, row in enumerate(rows):
+            color = YELLOW if i == 0 else WHITE
+            for x, text in zip(self.COLUMNS, row):
+                surface.blit(text_cache.render(self.font, text, color), (x, 3 + i * self.ROW_HEIGHT))
+        for i, line in enumerate(counters, len(rows)):
+            surface.blit(line, (self.COLUMNS[0], 3 + i * self.ROW_HEIGHT))
+        return surface, surface.get_rect(topleft=(10, 110))
+
+    def draw(self, renderer):
+        if not self.visible:
+            return None
+        self.layer.update(self.profiler.frames // PROFILER_REFRESH)
+        self.layer.draw(renderer)
+        left, top = self.layer.rect.bottomleft
+        self.draw_graph(renderer.overlay(), pygame.Rect(left, top + 4, self.WIDTH, self.GRAPH_HEIGHT))
+
+    def draw_graph(self, surface, rect):
+        # Frame times left to right, clipped at PROFILER_GRAPH_MS, with the
+        # frame budget as a line
+        pygame.draw.rect(surface, (0, 0, 0, 170), rect)
+        scale = rect.height / PROFILER_GRAPH_MS
+        budget_y = rect.bottom - min(1000 / FPS, PROFILER_GRAPH_MS) * scale
+        pygame.draw.line(surface, YELLOW, (rect.left, budget_y), (rect.right - 1, budget_y))
+        times = self.profiler.frame_times.ordered()
+        if len(times) < 2:
+            return
+        step = rect.width / (self.profiler.frame_times.values.size - 1)
+        points = [(rect.left + i * step, rect.bottom - min(ms, PROFILER_GRAPH_MS) * scale) for i, ms in enumerate(times)]
+        pygame.draw.lines(surface, GREEN, False, points)
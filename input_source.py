@@ -0,0 +1,64 @@
+import pygame
+
+class PygameInput:
+    # Live keyboard, mouse and event queue from pygame
+    def events(self):
+        return pygame.event.get()
+
+    def keys(self):
+        return pygame.key.get_pressed()
+
+    def mouse_pos(self):
+        return pygame.mouse.get_pos()
+
+class KeyState:
+    # Indexable like pygame.key.get_pressed(), backed by a set of key codes
+    def __init__(self, pressed):
+        self.pressed = pressed
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+class ScriptedInput:
+    """
+    Input set from code instead of read from devices: held keys, the mouse
+    position and a queue of events handed out on the next events() call.
+    Used to drive Game without a window.
+    """
+    def __init__(self):
+        self.pressed = set()
+        self.mouse = (0, 0)
+        self.queue = []
+
+    def events(self):
+        events = self.queue
+        self.queue = []
+        return events
+
+    def keys(self):
+        return KeyState(self.pressed)
+
+    def mouse_pos(self):
+        return self.mouse
+
+    def post(self, event):
+        self.queue.append(event)
+
+    def press(self, key):
+        # Hold key down and queue its KEYDOWN event
+        self.pressed.add(key)
+        self.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0))
+
+    def release(self, key):
+        self.pressed.discard(key)
+        self.post(pygame.event.Event(pygame.KEYUP, key=key, mod=0, unicode="", scancode=0))
+
+    def tap(self, key):
+        # KEYDOWN and KEYUP in the same frame, for one-shot actions
+        self.press(key)
+        self.release(key)
+
+    def click(self, pos, button=1):
+        self.mouse = pos
+        self.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=button))
+        self.post(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=pos, button=button))
@@ -1,10 +1,20 @@
 import sys
+import time
 import traceback
 import pygame
 from game import Game
-from config import SCREEN_WIDTH, SCREEN_HEIGHT, TITLE
+from render import create_renderer
+from input_source import PygameInput
+from replay import InputRecorder, snapshot, default_path
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, MAX_RENDER_FPS, VSYNC_MAX_FPS, RUN_SEED, RECORD_PATH
+
+def stop_recording(game):
+    if game is not None and game.recorder:
+        print("Input recorded: " + game.recorder.close(snapshot(game)))
+        game.recorder = None
 
 def main():
+    game = None
     try:
         # Initialize only what we need to avoid crashes with audio/joystick drivers on some Android devices
         try:
@@ -16,32 +26,54 @@ def main():
         # Explicitly do NOT initialize mixer to prevent crashes
         # pygame.mixer.init() 
 
-        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption(TITLE)
+        # Software display surface or SDL2 renderer, see RENDER_BACKEND and
+        # RENDER_SCALE / DISPLAY_SCALED / DISPLAY_VSYNC in config
+        renderer = create_renderer()
         clock = pygame.time.Clock()
+        # Stay capped when vsync was asked for but not applied
+        max_fps = VSYNC_MAX_FPS if renderer.vsync else MAX_RENDER_FPS
         
-        game = Game(screen)
+        input_source = PygameInput()
+        game = Game(getattr(renderer, "screen", None), renderer, input_source, RUN_SEED)
+        if RECORD_PATH:
+            path = default_path() if RECORD_PATH == "1" else RECORD_PATH
+            game.recorder = InputRecorder(path, game.seed, game.touch_active)
+        timestep = game.timestep
         
+        profiler = game.profiler
         while True:
             # Event handling
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                game.handle_input(event)
-                
-            # Update
-            game.update()
+            with profiler.section("input"):
+                for event in input_source.events():
+                    if event.type == pygame.QUIT:
+                        stop_recording(game)
+                        pygame.quit()
+                        sys.exit()
+                    game.handle_input(event)
             
-            # Draw
-            game.draw()
+            # Update in fixed steps, as many as real time has covered
+            with profiler.section("update"):
+                for _ in range(timestep.advance(time.perf_counter())):
+                    game.update()
             
-            pygame.display.flip()
-            clock.tick(60)
+            # Draw between the last two simulated states
+            with profiler.section("draw"):
+                dirty = game.draw(timestep.alpha())
+            
+            # Static screens report only what changed
+            with profiler.section("present"):
+                renderer.present(dirty)
+            profiler.end_frame()
+            clock.tick(max_fps)
 
     except Exception:
         # Crash Handler - Show error on screen
         error_msg = traceback.format_exc()
+        # Keep the input that led here for replay
+        try:
+            stop_recording(game)
+        except Exception:
+            pass
         try:
             if not pygame.display.get_init():
                 pygame.display.init()
@@ -0,0 +1,131 @@
+import time
+import numpy as np
+from config import *
+from capture import FrameCapture
+
+class Section:
+    # Reusable timer for one named section, adds to the profiler's frame
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        profiler = self.profiler
+        frame = profiler.frame
+        frame[self.name] = frame.get(self.name, 0.0) + (end - self.start) * 1000
+        if profiler.capture is not None:
+            profiler.capture.span(self.name, self.start, end)
+        return False
+
+class NullSection:
+    # Stands in for every section while the profiler is off
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+NULL_SECTION = NullSection()
+
+class RingBuffer:
+    # The last size samples of one series, oldest overwritten first
+    def __init__(self, size=PROFILER_HISTORY):
+        self.values = np.zeros(size)
+        self.index = 0
+        self.count = 0
+
+    def append(self, value):
+        self.values[self.index] = value
+        self.index = (self.index + 1) % len(self.values)
+        self.count = min(self.count + 1, len(self.values))
+
+    def ordered(self):
+        # Samples oldest to newest
+        if self.count < len(self.values):
+            return self.values[:self.count]
+        return np.roll(self.values, -self.index)
+
+    def stats(self):
+        # (min, avg, p99) in ms, or None before the first sample
+        if not self.count:
+            return None
+        values = self.values[:self.count]
+        return values.min(), values.mean(), np.percentile(values, 99)
+
+class Profiler:
+    """
+    Per-frame wall time of named sections, in milliseconds. Code wraps its
+    hot paths in `with profiler.section("name"):` and the main loop calls
+    end_frame() once per rendered frame. Different sections may nest, and
+    a section entered several times in a frame adds up.
+
+    While disabled, section() hands out a shared no-op and end_frame()
+    records nothing. While enabled, every section and the time between
+    end_frame() calls also go into rolling history for the overlay.
+    start_capture() times sections for a window of frames even while
+    disabled, see capture.py.
+    """
+    def __init__(self, enabled=True, history=PROFILER_HISTORY):
+        self.enabled = enabled
+        self.sections = {}
+        self.frame = {}
+        self.frames = 0
+        self.history_size = history
+        self.history = {} # name -> RingBuffer of ms, frames it ran in
+        self.frame_times = RingBuffer(history) # ms between end_frame() calls
+        self.last_end = None
+        self.capture = None
+        self.last_capture = [] # Paths written by the latest capture
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.frame = {}
+        self.last_end = None
+
+    def start_capture(self, frames=CAPTURE_FRAMES, profile=CAPTURE_CPROFILE):
+        # Ignored while a capture is running
+        if self.capture is None:
+            self.frame = {}
+            self.capture = FrameCapture(frames, profile)
+
+    def finish_capture(self):
+        self.last_capture = self.capture.save()
+        self.capture = None
+        print("Capture saved: " + ", ".join(self.last_capture))
+
+    def section(self, name):
+        if not self.enabled and self.capture is None:
+            return NULL_SECTION
+        section = self.sections.get(name)
+        if section is None:
+            section = self.sections[name] = Section(self, name)
+        return section
+
+    def end_frame(self):
+        # Returns {section: ms} for the frame that just ended
+        if not self.enabled and self.capture is None:
+            return self.frame
+        frame = self.frame
+        self.frame = {}
+        now = time.perf_counter()
+        if self.capture is not None and self.capture.end_frame(now):
+            self.finish_capture()
+        if not self.enabled:
+            return frame
+        self.frames += 1
+        history = self.history
+        for name, ms in frame.items():
+            buffer = history.get(name)
+            if buffer is None:
+                buffer = history[name] = RingBuffer(self.history_size)
+            buffer.append(ms)
+        if self.last_end is not None:
+            self.frame_times.append((now - self.last_end) * 1000)
+        self.last_end = now
+        return frame
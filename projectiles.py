@@ -0,0 +1,285 @@
+import math
+import numpy as np
+import pygame
+from config import *
+
+OWNER_PLAYER = 0
+OWNER_ENEMY = 1
+
+# Projectile kinds. Each kind has one shared image, size and draw layer.
+KIND_BULLET = 0
+KIND_SLASH = 1
+KIND_ENEMY_BULLET = 2
+
+KIND_SIZES = {
+    KIND_BULLET: BULLET_SIZE,
+    KIND_SLASH: SWORD_SLASH_SIZE,
+    KIND_ENEMY_BULLET: ENEMY_BULLET_SIZE,
+}
+KIND_COLORS = {
+    KIND_BULLET: BULLET_COLOR,
+    KIND_SLASH: SWORD_COLOR,
+    KIND_ENEMY_BULLET: ENEMY_BULLET_COLOR,
+}
+KIND_LAYERS = {
+    KIND_BULLET: LAYER_PROJECTILES,
+    KIND_SLASH: LAYER_FX,
+    KIND_ENEMY_BULLET: LAYER_PROJECTILES,
+}
+
+def slab(p0, d, lo, hi):
+    # Fractions of the move d from p0 where the point is strictly inside
+    # (lo, hi) on one axis, as (enter, exit); enter >= exit when never
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_lo = (lo - p0) / d
+        t_hi = (hi - p0) / d
+    still = d == 0
+    inside = (lo < p0) & (p0 < hi)
+    enter = np.where(still, np.where(inside, -np.inf, np.inf), np.minimum(t_lo, t_hi))
+    exit = np.where(still, np.where(inside, np.inf, -np.inf), np.maximum(t_lo, t_hi))
+    return enter, exit
+
+def box_entry(x0, y0, dx, dy, half, tx, ty, ts):
+    # Fraction of the move (dx, dy) at which a box of the given half size
+    # centred at (x0, y0) first overlaps tile (tx, ty), inf when it doesn't
+    # within the move. Touching edges don't count as overlap.
+    enter_x, exit_x = slab(x0, dx, tx * ts - half, (tx + 1) * ts + half)
+    enter_y, exit_y = slab(y0, dy, ty * ts - half, (ty + 1) * ts + half)
+    enter = np.maximum(enter_x, enter_y)
+    exit = np.minimum(exit_x, exit_y)
+    hit = (enter < exit) & (enter < 1) & (exit > 0)
+    return np.where(hit, np.maximum(enter, 0), np.inf)
+
+class ProjectileSystem:
+    """
+    Fixed-size pool of projectiles stored as NumPy arrays. Positions
+    (centers), velocities, damage, remaining lifetime, owner and kind live
+    in preallocated slots that are acquired and released through a free
+    list, and one vectorized step integrates, expires, culls and wall-tests
+    them all. Drawing uses one pre-rendered image per kind.
+    """
+    def __init__(self, capacity=MAX_PROJECTILES):
+        self.capacity = capacity
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.prev_x = np.zeros(capacity)
+        self.prev_y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.damage = np.zeros(capacity)
+        self.life = np.zeros(capacity, dtype=np.int32) # Frames left
+        self.owner = np.zeros(capacity, dtype=np.int8)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.alive = np.zeros(capacity, dtype=np.bool_)
+        self.images = {}
+        self.half = np.array([KIND_SIZES[k] // 2 for k in sorted(KIND_SIZES)], dtype=np.float64)
+        self.reset_stats()
+        self.clear()
+
+    def clear(self):
+        # Empties the pool; the stats keep counting across levels
+        self.alive[:] = False
+        # Lowest slots on top of the stack, so live slots stay packed at the front
+        self.free = list(range(self.capacity - 1, -1, -1))
+        self.top = 0 # Slots at or above this index have never been used
+        self.live = 0
+
+    def reset_stats(self):
+        self.high_water = 0
+        self.dropped = 0
+
+    def acquire(self):
+        # Free slot index, or None when the pool is at its cap
+        if not self.free:
+            return None
+        i = self.free.pop()
+        if i >= self.top:
+            self.top = i + 1
+        self.live += 1
+        if self.live > self.high_water:
+            self.high_water = self.live
+        return i
+
+    def release(self, slots):
+        # Return an array of live slot indices to the pool
+        if len(slots) == 0:
+            return
+        self.alive[slots] = False
+        self.free.extend(slots.tolist())
+        self.live -= len(slots)
+
+    def spawn(self, x, y, angle, speed, damage, lifetime, owner, kind):
+        # Every projectile needs a lifetime. Returns False when the cap is hit.
+        i = self.acquire()
+        if i is None:
+            self.dropped += 1
+            return False
+        self.x[i] = self.prev_x[i] = x
+        self.y[i] = self.prev_y[i] = y
+        self.vx[i] = math.cos(angle) * speed
+        self.vy[i] = math.sin(angle) * speed
+        self.damage[i] = damage
+        self.life[i] = lifetime
+        self.owner[i] = owner
+        self.kind[i] = kind
+        self.alive[i] = True
+        return True
+
+    def __len__(self):
+        return self.live
+
+    def pool_stats(self):
+        return {
+            "live": self.live,
+            "high_water": self.high_water,
+            "capacity": self.capacity,
+            "dropped": self.dropped,
+        }
+
+    def step(self, collider):
+        n = self.top
+        if self.live == 0:
+            return
+        x, y = self.x[:n], self.y[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+        # Free slots are moved too, which is cheaper than masking them out
+        x += self.vx[:n]
+        y += self.vy[:n]
+        life = self.life[:n]
+        life -= 1
+
+        alive = self.alive[:n]
+        dead = life <= 0
+        # Off the map entirely, whatever the edge tiles are
+        map_w = collider.width * collider.tile_size
+        map_h = collider.height * collider.tile_size
+        dead |= (x < 0) | (y < 0) | (x >= map_w) | (y >= map_h)
+        # A projectile that hits a wall stops at the impact point
+        t = self.wall_hits(collider, n)
+        hit = t <= 1
+        x[hit] = self.prev_x[:n][hit] + self.vx[:n][hit] * t[hit]
+        y[hit] = self.prev_y[:n][hit] + self.vy[:n][hit] * t[hit]
+        dead |= hit
+        self.release(np.flatnonzero(alive & dead))
+
+    def wall_hits(self, collider, n):
+        # Swept box test: a projectile's box hits a wall tile when its centre
+        # path enters the tile grown by the box's half size. Returns, per
+        # slot, the fraction of this step's move at first contact, inf for
+        # none. A projectile moving less than a tile per frame can only
+        # touch the 3x3 tiles from the corner of its swept bounds, so those
+        # are tested for all of them at once.
+        ts = collider.tile_size
+        half = self.half[self.kind[:n]]
+        x0, y0 = self.prev_x[:n], self.prev_y[:n]
+        dx, dy = self.vx[:n], self.vy[:n]
+        tx_lo = np.floor((x0 - half + np.minimum(dx, 0)) / ts).astype(np.int64)
+        ty_lo = np.floor((y0 - half + np.minimum(dy, 0)) / ts).astype(np.int64)
+        tx_hi = np.floor((x0 + half + np.maximum(dx, 0)) / ts).astype(np.int64)
+        ty_hi = np.floor((y0 + half + np.maximum(dy, 0)) / ts).astype(np.int64)
+
+        t = np.full(n, np.inf)
+        for ox in range(3):
+            tx = tx_lo + ox
+            for oy in range(3):
+                ty = ty_lo + oy
+                near = (tx <= tx_hi) & (ty <= ty_hi) & collider.solid_at(tx, ty)
+                if near.any():
+                    t = np.minimum(t, np.where(near, box_entry(x0, y0, dx, dy, half, tx, ty, ts), np.inf))
+
+        # Anything faster than a tile per frame tests every tile in its bounds
+        long_steps = np.flatnonzero(self.alive[:n] & ((tx_hi - tx_lo > 2) | (ty_hi - ty_lo > 2)))
+        for i in long_steps:
+            ty, tx = np.mgrid[ty_lo[i]:ty_hi[i] + 1, tx_lo[i]:tx_hi[i] + 1]
+            solid = collider.solid_at(tx.ravel(), ty.ravel())
+            entry = box_entry(x0[i], y0[i], dx[i], dy[i], half[i], tx.ravel()[solid], ty.ravel()[solid], ts)
+            t[i] = entry.min(initial=np.inf)
+        return t
+
+    def overlapping(self, rect, owner):
+        # Slots of live projectiles of one owner whose box overlaps rect, and
+        # how many projectiles were tested against it
+        n = self.top
+        half = self.half[self.kind[:n]]
+        x, y = self.x[:n], self.y[:n]
+        mask = self.alive[:n] & (self.owner[:n] == owner)
+        tested = int(np.count_nonzero(mask))
+        mask &= (x + half > rect.left) & (x - half < rect.right)
+        mask &= (y + half > rect.top) & (y - half < rect.bottom)
+        return np.flatnonzero(mask), tested
+
+    def occupied_cells(self, owner, cell_size):
+        # Spatial hash cells touched by the live projectiles of one owner
+        n = self.top
+        mask = self.alive[:n] & (self.owner[:n] == owner)
+        if not mask.any():
+            return []
+        half = self.half[self.kind[:n][mask]]
+        x, y = self.x[:n][mask], self.y[:n][mask]
+        # Projectiles are no larger than a cell, so their four corners cover
+        # every cell they touch
+        x_lo = np.floor((x - half) / cell_size).astype(np.int64).tolist()
+        x_hi = (np.ceil((x + half) / cell_size) - 1).astype(np.int64).tolist()
+        y_lo = np.floor((y - half) / cell_size).astype(np.int64).tolist()
+        y_hi = (np.ceil((y + half) / cell_size) - 1).astype(np.int64).tolist()
+        cells = set()
+        for cx0, cx1, cy0, cy1 in zip(x_lo, x_hi, y_lo, y_hi):
+            cells.update(((cx0, cy0), (cx1, cy0), (cx0, cy1), (cx1, cy1)))
+        return cells
+
+    def collide_sprites(self, sprites, owner, stats=None):
+        # Projectiles are consumed by the first sprite they touch. Returns
+        # {sprite: [damage, ...]} like groupcollide's hit lists.
+        collisions = {}
+        for sprite in sprites:
+            if not sprite.alive():
+                continue
+            hits, tested = self.overlapping(sprite.rect, owner)
+            if stats is not None:
+                stats.pairs_tested += tested
+                stats.collisions_found += len(hits)
+            if len(hits):
+                collisions[sprite] = self.damage[hits].tolist()
+                self.release(hits)
+        return collisions
+
+    def collide_hash(self, spatial_hash, owner):
+        # Only sprites in the cells the owner's projectiles touch are tested
+        cells = self.occupied_cells(owner, spatial_hash.cell_size)
+        if not cells:
+            return {}
+        return self.collide_sprites(spatial_hash.query_cells(cells), owner, spatial_hash.stats)
+
+    def image_for(self, kind):
+        image = self.images.get(kind)
+        if image is None:
+            size = KIND_SIZES[kind]
+            image = pygame.Surface((size, size))
+            image.fill(KIND_COLORS[kind])
+            self.images[kind] = image
+        return image
+
+    def queue(self, pipeline, camera, alpha=1.0):
+        # Add the projectiles inside the camera view to the render pipeline,
+        # alpha of the way along their last step
+        n = self.top
+        if self.live == 0:
+            return
+        view = camera.view_rect()
+        half = self.half[self.kind[:n]]
+        x, y = self.x[:n], self.y[:n]
+        if alpha < 1.0:
+            x = self.prev_x[:n] + (x - self.prev_x[:n]) * alpha
+            y = self.prev_y[:n] + (y - self.prev_y[:n]) * alpha
+        mask = self.alive[:n].copy()
+        mask &= (x + half > view.left) & (x - half < view.right)
+        mask &= (y + half > view.top) & (y - half < view.bottom)
+        visible = np.flatnonzero(mask)
+        if len(visible) == 0:
+            return
+        ox, oy = camera.draw_offset
+        left = (x[visible].astype(np.int64) - half[visible].astype(np.int64) + ox).tolist()
+        top = (y[visible].astype(np.int64) - half[visible].astype(np.int64) + oy).tolist()
+        for kind, px, py in zip(self.kind[visible].tolist(), left, top):
+            pipeline.add(KIND_LAYERS[kind], self.image_for(kind), (px, py))
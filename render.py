@@ -0,0 +1,305 @@
+import weakref
+import pygame
+from config import *
+
+LOGICAL_SIZE = (SCREEN_WIDTH, SCREEN_HEIGHT)
+MOUSE_EVENTS = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION)
+FINGER_EVENTS = (pygame.FINGERDOWN, pygame.FINGERUP, pygame.FINGERMOTION)
+# From this version SDL's renderer maps finger events into its logical
+# viewport, letterbox included, for pygame.SCALED displays
+SDL_MAPS_TOUCH = (2, 0, 18)
+
+def internal_size(scale):
+    return max(1, round(SCREEN_WIDTH * scale)), max(1, round(SCREEN_HEIGHT * scale))
+
+class SoftwareRenderer:
+    """
+    Default backend: plain blits onto the pygame display surface.
+
+    The game always draws in logical SCREEN_WIDTH x SCREEN_HEIGHT coordinates.
+    With a render scale below 1 the frame is drawn at the smaller internal
+    resolution instead, using scaled copies of each surface, and upscaled to
+    the window: by SDL when the display was opened with pygame.SCALED at the
+    internal size, otherwise by a software scale on present.
+    """
+    name = "software"
+
+    def __init__(self, screen, scale=1.0, vsync=False, scaled=False):
+        self.screen = screen
+        self.scale = scale
+        self.vsync = vsync # Whether presents wait for the display
+        # Unscaled, the display surface is the window and fingers need no
+        # mapping; scaled, only older SDL leaves the letterbox to us
+        self.letterbox_touch = scaled and pygame.get_sdl_version() < SDL_MAPS_TOUCH
+        self.scaled_images = weakref.WeakKeyDictionary() # Surface -> scaled copy
+        self.logical_overlay = None
+        self.overlay_used = False
+        if screen.get_size() == internal_size(scale):
+            self.target = screen
+        else:
+            self.target = pygame.Surface(internal_size(scale)).convert()
+        # Surface.fblits skips building the list of result rects (pygame-ce)
+        self.fblits = getattr(self.target, "fblits", None) or (lambda sequence: self.target.blits(sequence, doreturn=False))
+        # Mouse positions arrive in display surface coordinates
+        self.input_scale = SCREEN_WIDTH / screen.get_width()
+
+    def get_rect(self):
+        return pygame.Rect((0, 0), LOGICAL_SIZE)
+
+    def image_for(self, surface):
+        if self.scale == 1:
+            return surface
+        image = self.scaled_images.get(surface)
+        if image is None:
+            w, h = surface.get_size()
+            size = (max(1, round(w * self.scale)), max(1, round(h * self.scale)))
+            image = pygame.transform.smoothscale(surface, size)
+            self.scaled_images[surface] = image
+        return image
+
+    def forget(self, surface):
+        # Drop the scaled copy of a surface that was repainted
+        self.scaled_images.pop(surface, None)
+
+    def begin_frame(self, color):
+        self.target.fill(color)
+
+    def blit(self, surface, dest):
+        if self.scale == 1:
+            self.target.blit(surface, dest)
+        else:
+            self.target.blit(self.image_for(surface), (round(dest[0] * self.scale), round(dest[1] * self.scale)))
+
+    def blits(self, sequence):
+        # sequence: [(surface, (x, y)), ...] submitted in one call
+        if self.scale != 1:
+            scale = self.scale
+            image_for = self.image_for
+            sequence = [(image_for(surface), (round(x * scale), round(y * scale))) for surface, (x, y) in sequence]
+        self.fblits(sequence)
+
+    def overlay(self):
+        # Target for immediate-mode pygame.draw calls in logical coordinates
+        if self.scale == 1:
+            return self.target
+        if self.logical_overlay is None:
+            self.logical_overlay = pygame.Surface(LOGICAL_SIZE, pygame.SRCALPHA)
+        if not self.overlay_used:
+            self.logical_overlay.fill((0, 0, 0, 0))
+            self.overlay_used = True
+        return self.logical_overlay
+
+    def present(self, dirty=None):
+        # dirty: None = whole frame, [] = nothing changed, else changed rects
+        if dirty is not None and not dirty:
+            return
+        if self.overlay_used:
+            self.target.blit(pygame.transform.smoothscale(self.logical_overlay, self.target.get_size()), (0, 0))
+            self.overlay_used = False
+        if self.target is not self.screen:
+            pygame.transform.scale(self.target, self.screen.get_size(), self.screen)
+        if dirty is None or self.scale != 1:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty)
+
+    def to_logical(self, pos):
+        if self.input_scale == 1:
+            return pos
+        return (int(pos[0] * self.input_scale), int(pos[1] * self.input_scale))
+
+    def finger_to_logical(self, x, y):
+        # Finger coordinates are normalized to the window, or already to the
+        # logical area when SDL mapped them
+        if not self.letterbox_touch:
+            return x, y
+        win_w, win_h = pygame.display.get_window_size()
+        return letterbox(x, y, win_w, win_h)
+
+    def map_event(self, event):
+        return map_event(self, event)
+
+class SDL2Renderer:
+    """
+    Hardware backend drawing through an SDL2 Renderer. Surfaces are uploaded
+    as Textures the first time they are drawn and the texture is reused for
+    as long as the surface lives, so surfaces must not change once drawn
+    (tile chunks, atlas sprites and cached text all qualify).
+
+    With a render scale below 1 the frame is drawn into a smaller target
+    texture through the renderer's scale and stretched over the window.
+    """
+    name = "sdl2"
+
+    def __init__(self, size=LOGICAL_SIZE, title=TITLE, scale=1.0, vsync=False):
+        from pygame._sdl2 import video
+        self.video = video
+        self.size = size
+        self.scale = scale
+        self.window = video.Window(title, size=size)
+        self.renderer = video.Renderer(self.window, accelerated=-1, vsync=vsync)
+        self.vsync = vsync
+        self.textures = weakref.WeakKeyDictionary() # Surface -> Texture
+        self.overlay_surface = None
+        self.overlay_texture = None
+        self.overlay_used = False
+        self.target = None
+        if scale != 1:
+            self.target = video.Texture(self.renderer, internal_size(scale), target=True)
+
+    def get_rect(self):
+        return pygame.Rect((0, 0), self.size)
+
+    def texture_for(self, surface):
+        texture = self.textures.get(surface)
+        if texture is None:
+            texture = self.video.Texture.from_surface(self.renderer, surface)
+            self.textures[surface] = texture
+        return texture
+
+    def forget(self, surface):
+        # Drop the texture of a surface that was repainted, see texture_for
+        self.textures.pop(surface, None)
+
+    def begin_frame(self, color):
+        if self.target is not None:
+            self.renderer.target = self.target
+            self.renderer.scale = (self.scale, self.scale)
+        self.renderer.draw_color = color
+        self.renderer.clear()
+
+    def blit(self, surface, dest):
+        # Subsurfaces (atlas sprites) draw a region of their parent's texture
+        root = surface.get_abs_parent()
+        texture = self.texture_for(root)
+        w, h = surface.get_size()
+        if root is surface:
+            texture.draw(dstrect=(dest[0], dest[1], w, h))
+        else:
+            ox, oy = surface.get_abs_offset()
+            texture.draw(srcrect=(ox, oy, w, h), dstrect=(dest[0], dest[1], w, h))
+
+    def blits(self, sequence):
+        # No batched texture draw in pygame._sdl2, so submit one by one
+        blit = self.blit
+        for surface, dest in sequence:
+            blit(surface, dest)
+
+    def overlay(self):
+        # Immediate-mode drawing goes to a transparent layer uploaded on present
+        if self.overlay_surface is None:
+            self.overlay_surface = pygame.Surface(self.size, pygame.SRCALPHA)
+            self.overlay_texture = self.video.Texture(self.renderer, self.size, streaming=True)
+            self.overlay_texture.blend_mode = 1 # SDL_BLENDMODE_BLEND
+        if not self.overlay_used:
+            self.overlay_surface.fill((0, 0, 0, 0))
+            self.overlay_used = True
+        return self.overlay_surface
+
+    def present(self, dirty=None):
+        # The GPU back buffer is redrawn whole, so skip presenting unchanged frames
+        if dirty is not None and not dirty:
+            return
+        if self.overlay_used:
+            self.overlay_texture.update(self.overlay_surface)
+            self.overlay_texture.draw(dstrect=(0, 0) + self.size)
+            self.overlay_used = False
+        if self.target is not None:
+            self.renderer.target = None
+            self.target.draw(dstrect=(0, 0) + self.size)
+        self.renderer.present()
+
+    def to_logical(self, pos):
+        # The window is opened at the logical size
+        return pos
+
+    def finger_to_logical(self, x, y):
+        return x, y
+
+    def map_event(self, event):
+        return map_event(self, event)
+
+class RenderPipeline:
+    """
+    Collects world blits into explicit draw layers (LAYER_* in config) and
+    submits each layer as a single batched blits() call, back to front.
+    """
+    def __init__(self, layer_count=LAYER_COUNT):
+        self.layers = [[] for _ in range(layer_count)]
+
+    def add(self, layer, image, dest):
+        self.layers[layer].append((image, dest))
+
+    def add_sprites(self, sprites, offset, alpha=1.0):
+        # Sprites carry their draw layer as a class attribute. Moving ones
+        # are drawn alpha of the way from their previous simulated position.
+        ox, oy = offset
+        layers = self.layers
+        for sprite in sprites:
+            if sprite.interpolated and alpha < 1.0:
+                x, y = sprite.draw_pos(alpha)
+                dest = (round(x) + ox, round(y) + oy)
+            else:
+                rect = sprite.rect
+                dest = (rect.x + ox, rect.y + oy)
+            layers[sprite.layer].append((sprite.image, dest))
+
+    def submit(self, renderer):
+        for layer in self.layers:
+            if layer:
+                renderer.blits(layer)
+                layer.clear()
+
+def display_vsync():
+    # Whether the display surface is vsynced (pygame-ce 2.2+)
+    is_vsync = getattr(pygame.display, "is_vsync", None)
+    return bool(is_vsync and is_vsync())
+
+def letterbox(x, y, win_w, win_h):
+    # Map window-normalized coordinates into the aspect-fit logical area
+    fit = min(win_w / SCREEN_WIDTH, win_h / SCREEN_HEIGHT)
+    off_x = (win_w - SCREEN_WIDTH * fit) / 2
+    off_y = (win_h - SCREEN_HEIGHT * fit) / 2
+    return (x * win_w - off_x) / (SCREEN_WIDTH * fit), (y * win_h - off_y) / (SCREEN_HEIGHT * fit)
+
+def map_event(renderer, event):
+    # Rewrite pointer events into logical coordinates so input code can keep
+    # using event.pos and event.x * SCREEN_WIDTH at any render scale
+    if event.type in MOUSE_EVENTS:
+        pos = renderer.to_logical(event.pos)
+        if pos == event.pos:
+            return event
+        attrs = dict(event.__dict__)
+        attrs["pos"] = pos
+        if "rel" in attrs:
+            attrs["rel"] = renderer.to_logical(event.rel)
+        return pygame.event.Event(event.type, attrs)
+    if event.type in FINGER_EVENTS:
+        x, y = renderer.finger_to_logical(event.x, event.y)
+        if (x, y) == (event.x, event.y):
+            return event
+        attrs = dict(event.__dict__)
+        attrs["x"], attrs["y"] = x, y
+        return pygame.event.Event(event.type, attrs)
+    return event
+
+def create_renderer(backend=RENDER_BACKEND, scale=RENDER_SCALE, scaled=DISPLAY_SCALED, vsync=DISPLAY_VSYNC):
+    if backend == "sdl2":
+        try:
+            return SDL2Renderer(LOGICAL_SIZE, scale=scale, vsync=vsync)
+        except Exception as e:
+            # Keep the game running on devices without a usable SDL2 renderer
+            print(f"SDL2 renderer unavailable, using software: {e}")
+
+    if scaled:
+        # SDL upscales the small display surface to the window on the GPU
+        size, flags = internal_size(scale), pygame.SCALED
+    else:
+        size, flags = LOGICAL_SIZE, 0
+    try:
+        screen = pygame.display.set_mode(size, flags, vsync=int(vsync))
+    except pygame.error as e:
+        print(f"Vsync unavailable: {e}")
+        screen = pygame.display.set_mode(size, flags)
+    pygame.display.set_caption(TITLE)
+    return SoftwareRenderer(screen, scale, vsync and display_vsync(), scaled)
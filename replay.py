@@ -0,0 +1,195 @@
+"""
+Record a session's input and replay it exactly.
+
+    SG_RECORD=1 python main.py          # record to captures/input-*.sgrec
+    SG_RECORD=run.sgrec python main.py  # record to a given file
+    python replay.py run.sgrec [--draw] [--profile]
+
+A recording holds the session's RNG seed and, per simulation step, the
+input events Game handled before it plus the held movement keys and the
+mouse position read during it. Each event also carries the held keys and
+mouse position at the time it was handled, since handlers such as
+Player.use_skill read them too. Steps where nothing changed are left
+out. The file is gzipped JSON lines: a header, then one line per step
+that changed.
+
+Replay runs headless one step at a time with the same seed, so the game
+goes through the same states. The header also stores a snapshot of the
+final state, which replay compares against.
+"""
+import os
+import sys
+import gzip
+import json
+import time
+import zlib
+import pygame
+from config import *
+from input_source import KeyState
+
+FORMAT_VERSION = 2
+
+# The only keys Game reads as held state; everything else comes as events
+RECORDED_KEYS = (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d)
+
+RECORDED_EVENTS = {
+    pygame.KEYDOWN, pygame.KEYUP,
+    pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION,
+    pygame.FINGERDOWN, pygame.FINGERUP, pygame.FINGERMOTION,
+}
+
+def encode_event(event, input_source):
+    # [type, {attr: value}, key mask, mouse] with only the plain values
+    attrs = {}
+    for name, value in event.__dict__.items():
+        if isinstance(value, (bool, int, float, str)):
+            attrs[name] = value
+        elif isinstance(value, tuple):
+            attrs[name] = list(value)
+    return [event.type, attrs, key_mask(input_source.keys()), list(input_source.mouse_pos())]
+
+def decode_event(data):
+    event_type, attrs = data[:2]
+    attrs = {name: tuple(value) if isinstance(value, list) else value for name, value in attrs.items()}
+    return pygame.event.Event(event_type, attrs)
+
+def pressed_keys(mask):
+    return {key for bit, key in enumerate(RECORDED_KEYS) if mask & (1 << bit)}
+
+def key_mask(keys):
+    mask = 0
+    for bit, key in enumerate(RECORDED_KEYS):
+        if keys[key]:
+            mask |= 1 << bit
+    return mask
+
+def snapshot(game):
+    # Enough of the simulation state to tell whether a replay diverged
+    store = game.enemy_store
+    positions = store.x[store.alive].tobytes() + store.y[store.alive].tobytes()
+    return {
+        "state": game.state,
+        "level": game.level,
+        "score": game.score,
+        "hp": game.player.hp,
+        "player": [game.player.pos.x, game.player.pos.y],
+        "enemies": len(game.enemies),
+        "enemy_positions": zlib.crc32(positions),
+        "projectiles": len(game.projectiles),
+        "rng": zlib.crc32(repr(game.rng.getstate()).encode()),
+    }
+
+def default_path():
+    return os.path.join(CAPTURE_DIR, time.strftime("input-%Y%m%d-%H%M%S.sgrec"))
+
+class InputRecorder:
+    """
+    Attached to Game as game.recorder. Game hands it every event after
+    mapping to logical coordinates, with the input source it reads held
+    state from, and calls step() at the start of each update. Nothing is
+    written until close().
+    """
+    def __init__(self, path, seed, touch):
+        self.path = path
+        self.header = {"version": FORMAT_VERSION, "seed": seed, "touch": touch, "sim_rate": SIM_RATE}
+        self.steps = 0
+        self.records = []
+        self.pending = []
+        self.last = None
+
+    def event(self, event, input_source):
+        if event.type in RECORDED_EVENTS:
+            self.pending.append(encode_event(event, input_source))
+
+    def step(self, input_source):
+        held = (key_mask(input_source.keys()), list(input_source.mouse_pos()))
+        if self.pending or held != self.last:
+            self.records.append([self.steps, held[0], held[1], self.pending])
+            self.pending = []
+            self.last = held
+        self.steps += 1
+
+    def close(self, result=None):
+        # Writes the file, returns its path
+        self.header["steps"] = self.steps
+        self.header["result"] = result
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with gzip.open(self.path, "wt") as f:
+            f.write(json.dumps(self.header) + "\n")
+            for record in self.records:
+                f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        return self.path
+
+class ReplayInput:
+    """
+    Input source that plays a recording back. Each events() call moves to
+    the next simulation step and yields the events handled before it,
+    setting the held keys and mouse position each event was handled with
+    just before yielding it, then those of the step itself. Events are
+    already in logical coordinates.
+    """
+    logical = True
+
+    def __init__(self, path):
+        with gzip.open(path, "rt") as f:
+            self.header = json.loads(f.readline())
+            self.records = {}
+            for line in f:
+                record = json.loads(line)
+                self.records[record[0]] = record
+        self.step = 0
+        self.pressed = set()
+        self.mouse = (0, 0)
+
+    @property
+    def done(self):
+        return self.step >= self.header["steps"]
+
+    def events(self):
+        record = self.records.get(self.step)
+        self.step += 1
+        if record is None:
+            return []
+        return self.play(record)
+
+    def play(self, record):
+        _, mask, mouse, events = record
+        for event in events:
+            self.pressed = pressed_keys(event[2])
+            self.mouse = tuple(event[3])
+            yield decode_event(event)
+        self.pressed = pressed_keys(mask)
+        self.mouse = tuple(mouse)
+
+    def keys(self):
+        return KeyState(self.pressed)
+
+    def mouse_pos(self):
+        return self.mouse
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if not args:
+        print(__doc__)
+        sys.exit(1)
+    from headless import HeadlessRunner
+    source = ReplayInput(args[0])
+    header = source.header
+    runner = HeadlessRunner(source, draw="--draw" in sys.argv, touch=header["touch"], seed=header["seed"])
+    if "--profile" in sys.argv:
+        runner.game.profiler.start_capture(header["steps"], True)
+    start = time.perf_counter()
+    runner.step(header["steps"])
+    elapsed = time.perf_counter() - start
+    result = snapshot(runner.game)
+    print(json.dumps({
+        "steps": runner.steps,
+        "ms_per_step": elapsed * 1000 / max(1, runner.steps),
+        "result": result,
+        "matches": result == header["result"] if header.get("result") else None,
+    }))
+
+if __name__ == "__main__":
+    main()
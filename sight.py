@@ -0,0 +1,44 @@
+from config import *
+
+class LineOfSight:
+    """
+    Tile-to-tile visibility over the level grid, traced with the collider's
+    DDA between tile centres. The grid doesn't change during a level, so
+    answers are cached per tile pair until the cache fills up.
+    """
+    def __init__(self, collider, max_size=LOS_CACHE_SIZE):
+        self.collider = collider
+        self.max_size = max_size
+        self.cache = {}
+        self.hits = 0
+        self.misses = 0
+
+    def tiles_visible(self, a, b):
+        key = (a, b) if a <= b else (b, a)
+        visible = self.cache.get(key)
+        if visible is not None:
+            self.hits += 1
+            return visible
+        self.misses += 1
+        if len(self.cache) >= self.max_size:
+            self.cache.clear()
+        ts = self.collider.tile_size
+        half = ts / 2
+        (ax, ay), (bx, by) = key
+        visible = self.collider.raycast(ax * ts + half, ay * ts + half, bx * ts + half, by * ts + half) is None
+        self.cache[key] = visible
+        return visible
+
+    def visible(self, x0, y0, x1, y1):
+        # Whether the tiles holding two world points can see each other
+        ts = self.collider.tile_size
+        return self.tiles_visible((int(x0 // ts), int(y0 // ts)), (int(x1 // ts), int(y1 // ts)))
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self.cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
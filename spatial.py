@@ -0,0 +1,92 @@
+from config import *
+
+class CollisionStats:
+    # Broadphase counters, shared by the hashes of one frame
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.pairs_tested = 0
+        self.collisions_found = 0
+
+    def as_dict(self):
+        return {"pairs_tested": self.pairs_tested, "collisions_found": self.collisions_found}
+
+class SpatialHash:
+    """
+    Uniform grid of buckets keyed on cell coordinates. Sprites are filed under
+    every cell their rect overlaps, so rect queries only look at nearby sprites.
+    """
+    def __init__(self, cell_size=COLLISION_CELL_SIZE, stats=None):
+        self.cell_size = cell_size
+        self.cells = {} # (cx, cy) -> [sprite, ...]
+        self.stats = stats
+
+    def clear(self):
+        self.cells.clear()
+
+    def cell_range(self, rect):
+        cs = self.cell_size
+        return rect.left // cs, rect.top // cs, (rect.right - 1) // cs, (rect.bottom - 1) // cs
+
+    def insert(self, sprite):
+        x0, y0, x1, y1 = self.cell_range(sprite.rect)
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket is None:
+                    self.cells[(cx, cy)] = [sprite]
+                else:
+                    bucket.append(sprite)
+
+    def remove(self, sprite):
+        # Unfile a sprite that has not moved since it was inserted
+        x0, y0, x1, y1 = self.cell_range(sprite.rect)
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket is not None and sprite in bucket:
+                    bucket.remove(sprite)
+                    if not bucket:
+                        del self.cells[(cx, cy)]
+
+    def rebuild(self, sprites):
+        self.cells.clear()
+        for sprite in sprites:
+            self.insert(sprite)
+
+    def query_cells(self, cells):
+        # Sprites filed under any of the given cells, each reported once
+        found = {}
+        for cell in cells:
+            bucket = self.cells.get(cell)
+            if bucket is not None:
+                for sprite in bucket:
+                    found[sprite] = None
+        return list(found)
+
+    def collide_sprite(self, sprite, dokill=False):
+        # Like pygame.sprite.spritecollide against the hashed sprites. Sprites
+        # killed since the last rebuild are skipped.
+        rect = sprite.rect
+        seen = set()
+        hits = []
+        x0, y0, x1, y1 = self.cell_range(rect)
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket is None:
+                    continue
+                for other in bucket:
+                    if other in seen or other is sprite:
+                        continue
+                    seen.add(other)
+                    if other.rect.colliderect(rect) and other.alive():
+                        hits.append(other)
+        if self.stats is not None:
+            self.stats.pairs_tested += len(seen)
+            self.stats.collisions_found += len(hits)
+        if dokill:
+            for other in hits:
+                other.kill()
+        return hits
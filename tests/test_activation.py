@@ -0,0 +1,57 @@
+import pygame
+from config import TILE_SIZE
+from dungeon import Room
+from activation import EnemyActivation
+
+class Body(pygame.sprite.Sprite):
+    def __init__(self, tx, ty, room=None):
+        super().__init__()
+        self.rect = pygame.Rect(0, 0, 32, 32)
+        self.rect.center = (tx * TILE_SIZE + TILE_SIZE // 2, ty * TILE_SIZE + TILE_SIZE // 2)
+        self.room = room
+
+def test_enemy_in_known_room_sleeps_until_player_is_near():
+    room = Room(20, 20, 5, 5)
+    activation = EnemyActivation([room])
+    enemy = Body(22, 22, room)
+    activation.add(enemy)
+    activation.update(Body(2, 2))
+    assert activation.counts() == {"active": 0, "sleeping": 1}
+    activation.update(Body(19, 22))
+    assert activation.counts() == {"active": 1, "sleeping": 0}
+
+def test_unknown_room_starts_awake():
+    # A room from another level, or the tutorial's enemies with none
+    activation = EnemyActivation([Room(20, 20, 5, 5)])
+    activation.add(Body(3, 3, Room(1, 1, 4, 4)))
+    activation.add(Body(3, 3))
+    assert activation.counts() == {"active": 2, "sleeping": 0}
+
+def test_wake_tolerates_unknown_room():
+    activation = EnemyActivation([])
+    enemy = Body(3, 3, Room(1, 1, 4, 4))
+    activation.wake(enemy)
+    assert enemy in activation.active
+
+def test_sleeping_enemies_stay_in_their_hash_until_woken():
+    room = Room(20, 20, 5, 5)
+    activation = EnemyActivation([room])
+    shot, other = Body(21, 21, room), Body(23, 23, room)
+    activation.add(shot)
+    activation.add(other)
+    hashed = activation.sleeping_hash
+    assert hashed.collide_sprite(Body(21, 21)) == [shot]
+    activation.wake(shot)
+    assert hashed.collide_sprite(Body(21, 21)) == []
+    activation.update(Body(22, 22))
+    assert hashed.cells == {}
+    assert activation.counts() == {"active": 2, "sleeping": 0}
+
+def test_far_enemies_fall_asleep_into_the_hash():
+    room = Room(20, 20, 5, 5)
+    activation = EnemyActivation([room])
+    enemy = Body(22, 22)
+    activation.add(enemy)
+    activation.sleep_far(Body(60, 60))
+    assert enemy.room is room
+    assert activation.sleeping_hash.collide_sprite(Body(22, 22)) == [enemy]
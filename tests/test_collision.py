@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from tilegrid import TileGrid, FLOOR, WALL
+from collision import TileCollider
+
+TS = 48
+
+def room(width=8, height=8):
+    # Open floor with a one-tile wall border
+    grid = TileGrid(width, height)
+    grid.carve(1, 1, width - 2, height - 2)
+    return grid
+
+def test_move_x_stops_flush_against_wall():
+    collider = TileCollider(room().freeze(), TS)
+    # Right wall starts at x = 7 * TS
+    x = collider.move_x(5 * TS, 2 * TS, 32, 32, 100)
+    assert x == 7 * TS - 32
+    # Left wall ends at x = TS
+    x = collider.move_x(TS + 10, 2 * TS, 32, 32, -100)
+    assert x == TS
+
+def test_move_y_stops_flush_against_wall():
+    collider = TileCollider(room().freeze(), TS)
+    assert collider.move_y(2 * TS, 5 * TS, 32, 32, 100) == 7 * TS - 32
+    assert collider.move_y(2 * TS, TS + 10, 32, 32, -100) == TS
+
+def test_move_without_walls_is_unchanged():
+    collider = TileCollider(room().freeze(), TS)
+    assert collider.move(2 * TS, 2 * TS, 32, 32, 7.5, -3.25) == (2 * TS + 7.5, 2 * TS - 3.25)
+
+def test_move_slides_along_wall():
+    collider = TileCollider(room().freeze(), TS)
+    x, y = collider.move(5 * TS, 3 * TS, 32, 32, 100, 10)
+    assert (x, y) == (7 * TS - 32, 3 * TS + 10)
+
+def test_box_flush_with_wall_can_move_along_it():
+    collider = TileCollider(room().freeze(), TS)
+    x, y = collider.move(7 * TS - 32, 3 * TS, 32, 32, 0, 20)
+    assert (x, y) == (7 * TS - 32, 3 * TS + 20)
+
+def test_raycast_hits_first_solid_tile():
+    grid = room()
+    grid.carve(4, 2, 1, 1, WALL)
+    collider = TileCollider(grid.freeze(), TS)
+    y = 2.5 * TS
+    assert collider.raycast(1.5 * TS, y, 6.5 * TS, y) == pytest.approx((4 * TS, y))
+    # Going the other way it enters the same tile from its right side
+    assert collider.raycast(6.5 * TS, y, 1.5 * TS, y) == pytest.approx((5 * TS, y))
+
+def test_raycast_diagonal_enters_correct_tile():
+    grid = room()
+    grid.carve(3, 3, 1, 1, WALL)
+    collider = TileCollider(grid.freeze(), TS)
+    # Down-right through tile centres (1, 1) -> (5, 5) enters (3, 3) at its corner
+    hit = collider.raycast(1.5 * TS, 1.5 * TS, 5.5 * TS, 5.5 * TS)
+    assert hit == pytest.approx((3 * TS, 3 * TS))
+    # A line just above that diagonal enters through the tile's top edge
+    hit = collider.raycast(1.5 * TS, 1.5 * TS - 10, 5.5 * TS, 5.5 * TS - 10)
+    assert hit == pytest.approx((3 * TS + 10, 3 * TS))
+
+def test_raycast_clear_and_inside_solid():
+    collider = TileCollider(room().freeze(), TS)
+    assert collider.raycast(1.5 * TS, 1.5 * TS, 6.5 * TS, 6.5 * TS) is None
+    assert collider.raycast(0.5 * TS, 0.5 * TS, 3 * TS, 3 * TS) == (0.5 * TS, 0.5 * TS)
+
+def test_solid_at_counts_outside_as_wall():
+    grid = TileGrid(3, 3, FLOOR)
+    grid.carve(1, 1, 1, 1, WALL)
+    collider = TileCollider(grid.freeze(), TS)
+    tx = np.array([0, 1, -1, 3, 2])
+    ty = np.array([0, 1, 0, 0, 5])
+    assert collider.solid_at(tx, ty).tolist() == [False, True, True, True, True]
@@ -0,0 +1,89 @@
+import pygame
+import pytest
+from config import *
+from tilegrid import TileGrid, WALL
+from collision import TileCollider
+from projectiles import ProjectileSystem
+from enemy_store import EnemyStore
+
+TS = 48
+
+class Body:
+    # Stands in for an Enemy sprite: a rect and the slot the store gave it
+    def __init__(self, store, x, y, enemy_type=ENEMY_MELEE, hp_multiplier=1.0):
+        self.rect = pygame.Rect(x, y, ENEMY_SIZE, ENEMY_SIZE)
+        self.slot = store.add(self, x, y, enemy_type, hp_multiplier)
+
+class Target:
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(0, 0, 32, 32)
+        self.rect.center = (x, y)
+
+def open_room():
+    # 12x12 floor inside a wall border
+    grid = TileGrid(14, 14)
+    grid.carve(1, 1, 12, 12)
+    return grid
+
+def test_slots_are_reused_and_the_store_grows():
+    store = EnemyStore(2)
+    a, b = Body(store, 100, 100), Body(store, 200, 100, hp_multiplier=2.0)
+    c = Body(store, 300, 100)
+    assert store.capacity == 4 and len(store) == 3
+    assert store.hp[b.slot] == MELEE_HP_BASE * 2
+    assert (store.x[a.slot], store.x[c.slot]) == (100, 300)
+    store.release(b.slot)
+    store.release(b.slot)
+    assert len(store) == 2
+    assert Body(store, 0, 0).slot == b.slot
+
+def test_chasers_move_at_their_speed_and_sleepers_stay():
+    store = EnemyStore()
+    collider = TileCollider(open_room().freeze(), TS)
+    awake, asleep = Body(store, 100, 200), Body(store, 100, 300)
+    store.update(collider, Target(400, 200 + ENEMY_SIZE // 2), [awake])
+    assert store.x[awake.slot] == pytest.approx(100 + MELEE_SPEED)
+    assert store.y[awake.slot] == pytest.approx(200)
+    assert awake.rect.topleft == (round(100 + MELEE_SPEED), 200)
+    assert (store.x[asleep.slot], store.y[asleep.slot]) == (100, 300)
+    assert store.prev_x[awake.slot] == 100
+
+def test_ranged_enemies_hold_and_back_off():
+    store = EnemyStore()
+    collider = TileCollider(open_room().freeze(), TS)
+    holding = Body(store, 100, 100, ENEMY_RANGED)
+    close = Body(store, 100, 400, ENEMY_RANGED)
+    target = Target(100 + ENEMY_SIZE // 2 + RANGED_ATTACK_RANGE - 20, 100 + ENEMY_SIZE // 2)
+    store.update(collider, target, [holding])
+    assert store.x[holding.slot] == 100
+    store.update(collider, Target(140, 400 + ENEMY_SIZE // 2), [close])
+    assert store.x[close.slot] == pytest.approx(100 - RANGED_SPEED)
+
+def test_enemies_stop_flush_against_walls():
+    store = EnemyStore()
+    collider = TileCollider(open_room().freeze(), TS)
+    enemy = Body(store, TS + 1, 300)
+    for _ in range(5):
+        store.update(collider, Target(0, 300 + ENEMY_SIZE // 2), [enemy])
+    assert store.x[enemy.slot] == TS
+    assert enemy.rect.left == TS
+
+def test_ranged_fire_needs_range_cooldown_and_sight():
+    store = EnemyStore()
+    projectiles = ProjectileSystem(8)
+    shooter = Body(store, 100, 100, ENEMY_RANGED)
+    store.cooldown[shooter.slot] = 0
+    store.fire(projectiles, Target(100 + RANGED_ATTACK_RANGE * 2, 116), [shooter])
+    assert len(projectiles) == 0
+
+    class Blocked:
+        def visible(self, x0, y0, x1, y1):
+            return False
+    target = Target(300, 116)
+    store.fire(projectiles, target, [shooter], Blocked())
+    assert len(projectiles) == 0
+    store.fire(projectiles, target, [shooter])
+    assert len(projectiles) == 1
+    assert store.cooldown[shooter.slot] == RANGED_COOLDOWN
+    store.fire(projectiles, target, [shooter])
+    assert len(projectiles) == 1
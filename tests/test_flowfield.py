@@ -0,0 +1,63 @@
+import numpy as np
+from tilegrid import TileGrid, WALL
+from collision import TileCollider
+from flowfield import FlowField
+
+# . floor, # wall
+LAYOUT = [
+    "#######",
+    "#.....#",
+    "#.###.#",
+    "#.#...#",
+    "#.#.###",
+    "#...#.#",
+    "#######",
+]
+
+def field():
+    grid = TileGrid(len(LAYOUT[0]), len(LAYOUT))
+    for ty, row in enumerate(LAYOUT):
+        for tx, cell in enumerate(row):
+            if cell == ".":
+                grid.carve(tx, ty, 1, 1)
+    return FlowField(TileCollider(grid.freeze()))
+
+def test_bfs_distances_on_known_grid():
+    flow = field()
+    flow.build(1, 1)
+    assert flow.dist.tolist() == [
+        [-1, -1, -1, -1, -1, -1, -1],
+        [-1, 0, 1, 2, 3, 4, -1],
+        [-1, 1, -1, -1, -1, 5, -1],
+        [-1, 2, -1, 8, 7, 6, -1],
+        [-1, 3, -1, 7, -1, -1, -1],
+        [-1, 4, 5, 6, -1, -1, -1],
+        [-1, -1, -1, -1, -1, -1, -1],
+    ]
+
+def test_steps_lead_one_closer():
+    flow = field()
+    flow.build(1, 1)
+    ys, xs = np.nonzero(flow.dist > 0)
+    for tx, ty in zip(xs.tolist(), ys.tolist()):
+        nx, ny = tx + flow.step_x[ty, tx], ty + flow.step_y[ty, tx]
+        assert flow.dist[ny, nx] == flow.dist[ty, tx] - 1
+
+def test_no_diagonal_through_wall_corner():
+    flow = field()
+    flow.build(5, 3)
+    # (4, 3) -> (3, 4) would cut the corner of the wall at (4, 4)
+    assert flow.dist[4, 3] == 3
+    assert (flow.step_x[4, 3], flow.step_y[4, 3]) == (0, -1)
+
+def test_start_in_wall_reaches_nothing():
+    flow = field()
+    flow.build(0, 0)
+    assert (flow.dist == -1).all()
+
+def test_lookup_clamps_to_map():
+    flow = field()
+    flow.build(1, 1)
+    dist, sx, sy = flow.lookup(np.array([2, -5]), np.array([1, 1]))
+    assert dist.tolist() == [1, -1]
+    assert (sx.tolist(), sy.tolist()) == ([-1, 0], [0, 0])
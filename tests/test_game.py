@@ -0,0 +1,52 @@
+import pygame
+import pytest
+from headless import HeadlessRunner
+
+@pytest.fixture
+def runner():
+    runner = HeadlessRunner(seed=7)
+    runner.game.start_game()
+    runner.game.state = "PLAYING"
+    return runner
+
+def test_visible_sprites_are_those_in_view(runner):
+    game = runner.game
+    runner.step(5)
+    view = game.camera.view_rect()
+    visible = game.visible_sprites()
+    assert game.player in visible
+    assert set(visible) == {sprite for sprite in game.all_sprites if sprite.rect.colliderect(view)}
+    assert len(visible) < len(game.all_sprites)
+
+def test_text_cache_counts_from_each_new_game(runner):
+    runner.game.draw()
+    assert runner.game.stats()["text_cache"]["misses"] > 0
+    game = HeadlessRunner(seed=7).game
+    assert game.stats()["text_cache"]["hits"] == 0
+    assert game.stats()["text_cache"]["size"] == 0
+
+def test_static_screen_is_sent_once_per_state_change(runner):
+    game = runner.game
+    full = [game.renderer.get_rect()]
+    assert game.draw() is None
+    game.state = "MENU"
+    assert game.draw() == full
+    assert game.draw() == []
+    game.lang = "zh"
+    assert game.draw() == full
+    assert game.draw() == []
+    game.state = "GAMEOVER"
+    assert game.draw() == full
+    assert game.draw() == []
+
+def test_leaving_the_tutorial_starts_a_real_run():
+    runner = HeadlessRunner(seed=3)
+    game = runner.game
+    for key in (pygame.K_t, pygame.K_ESCAPE, pygame.K_RETURN):
+        runner.input.tap(key)
+        runner.step()
+    assert game.state == "PLAYING"
+    assert not game.on_tutorial_level
+    assert game.activation.rooms
+    runner.step(300)
+    assert len(game.enemies) > 0
@@ -0,0 +1,26 @@
+import pygame
+from hud import CachedLayer
+
+class Screen:
+    def __init__(self):
+        self.blits = []
+
+    def blit(self, surface, dest):
+        self.blits.append(dest)
+
+def test_layer_renders_only_when_its_key_changes():
+    renders = []
+    def render(key):
+        renders.append(key)
+        return pygame.Surface((10 * key, 10)), pygame.Rect(5, 5, 10 * key, 10)
+    layer = CachedLayer(render)
+    screen = Screen()
+    assert layer.update(2)
+    assert layer.draw(screen) == pygame.Rect(5, 5, 20, 10)
+    assert not layer.update(2)
+    assert layer.draw(screen) is None
+    # A smaller panel also reports the area it no longer covers
+    assert layer.update(1)
+    assert layer.draw(screen) == pygame.Rect(5, 5, 20, 10)
+    assert renders == [2, 1]
+    assert len(screen.blits) == 3
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+from tilegrid import TileGrid, WALL
+from collision import TileCollider
+from projectiles import ProjectileSystem, OWNER_PLAYER, KIND_BULLET, KIND_SIZES
+
+TS = 48
+HALF = KIND_SIZES[KIND_BULLET] // 2
+
+def collider_with_block(tx, ty):
+    # Open 6x6 floor with one wall tile
+    grid = TileGrid(6, 6, 0)
+    grid.carve(tx, ty, 1, 1, WALL)
+    return TileCollider(grid.freeze(), TS)
+
+def spawn(pool, x, y, angle=0.0, speed=10, lifetime=100):
+    return pool.spawn(x, y, angle, speed, 1, lifetime, OWNER_PLAYER, KIND_BULLET)
+
+def test_released_slots_are_reused_lowest_first():
+    pool = ProjectileSystem(8)
+    collider = collider_with_block(5, 5)
+    for y in (40, 60, 80):
+        spawn(pool, 20, y, lifetime=2 if y == 60 else 100)
+    assert len(pool) == 3 and pool.top == 3
+    pool.step(collider)
+    pool.step(collider)
+    assert len(pool) == 2
+    assert not pool.alive[1]
+    spawn(pool, 20, 100)
+    assert pool.alive[1] and pool.y[1] == 100
+    assert pool.top == 3
+
+def test_pool_cap_drops_and_keeps_high_water():
+    pool = ProjectileSystem(2)
+    assert spawn(pool, 10, 10)
+    assert spawn(pool, 10, 20)
+    assert not spawn(pool, 10, 30)
+    pool.clear()
+    assert len(pool) == 0
+    assert pool.pool_stats() == {"live": 0, "high_water": 2, "capacity": 2, "dropped": 1}
+    pool.reset_stats()
+    assert pool.pool_stats()["high_water"] == 0
+
+def test_expired_and_off_map_projectiles_are_released():
+    pool = ProjectileSystem(4)
+    collider = collider_with_block(5, 5)
+    spawn(pool, 100, 100, lifetime=1)
+    spawn(pool, 2, 100, angle=np.pi, speed=5)
+    pool.step(collider)
+    assert len(pool) == 0
+    assert sorted(pool.free) == [0, 1, 2, 3]
+
+def test_wall_hit_stops_at_impact_point():
+    pool = ProjectileSystem(4)
+    collider = collider_with_block(3, 1)
+    spawn(pool, 1.5 * TS, 1.5 * TS, speed=12)
+    for _ in range(10):
+        pool.step(collider)
+    assert len(pool) == 0
+    assert pool.x[0] == pytest.approx(3 * TS - HALF)
+    assert pool.y[0] == pytest.approx(1.5 * TS)
+
+def test_box_clipping_a_corner_hits():
+    pool = ProjectileSystem(4)
+    collider = collider_with_block(3, 2)
+    # The centre passes 2px above the wall tile, the box overlaps it
+    spawn(pool, 1.5 * TS, 2 * TS - HALF + 2, speed=12)
+    for _ in range(10):
+        pool.step(collider)
+    assert len(pool) == 0
+    assert pool.x[0] == pytest.approx(3 * TS - HALF)
+
+def test_box_flush_with_wall_passes():
+    pool = ProjectileSystem(4)
+    collider = collider_with_block(3, 2)
+    spawn(pool, 1.5 * TS, 2 * TS - HALF, speed=12)
+    for _ in range(10):
+        pool.step(collider)
+    assert len(pool) == 1
+
+def test_fast_projectile_cannot_skip_a_wall():
+    pool = ProjectileSystem(4)
+    collider = collider_with_block(3, 1)
+    spawn(pool, 1.5 * TS, 1.5 * TS, speed=3 * TS)
+    pool.step(collider)
+    assert len(pool) == 0
+    assert pool.x[0] == pytest.approx(3 * TS - HALF)
+
+def test_wall_hits_matches_per_projectile_raycast_for_points():
+    # With no box the sweep is a plain DDA, so it agrees with raycast
+    rng = np.random.default_rng(3)
+    grid = TileGrid(12, 12, 0)
+    for tx, ty in rng.integers(0, 12, (30, 2)).tolist():
+        grid.carve(tx, ty, 1, 1, WALL)
+    collider = TileCollider(grid.freeze(), TS)
+    pool = ProjectileSystem(200)
+    pool.half[:] = 0
+    for _ in range(200):
+        spawn(pool, *rng.uniform(0, 12 * TS, 2), angle=rng.uniform(0, 2 * np.pi), speed=rng.uniform(1, 60))
+    n = pool.top
+    pool.prev_x[:n] = pool.x[:n]
+    pool.prev_y[:n] = pool.y[:n]
+    pool.x[:n] += pool.vx[:n]
+    pool.y[:n] += pool.vy[:n]
+    t = pool.wall_hits(collider, n)
+    for i in range(n):
+        hit = collider.raycast(pool.prev_x[i], pool.prev_y[i], pool.x[i], pool.y[i])
+        if hit is None:
+            assert t[i] > 1
+        else:
+            assert pool.prev_x[i] + pool.vx[i] * t[i] == pytest.approx(hit[0])
+            assert pool.prev_y[i] + pool.vy[i] * t[i] == pytest.approx(hit[1])
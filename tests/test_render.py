@@ -0,0 +1,48 @@
+import pygame
+import pytest
+from config import SCREEN_WIDTH, SCREEN_HEIGHT
+from render import letterbox, map_event, create_renderer
+
+class StubRenderer:
+    # Mouse at half the logical size, fingers letterboxed in a 1920x1080 window
+    def to_logical(self, pos):
+        return (pos[0] * 2, pos[1] * 2)
+
+    def finger_to_logical(self, x, y):
+        return letterbox(x, y, 1920, 1080)
+
+@pytest.fixture
+def display():
+    pygame.display.init()
+    yield
+    pygame.display.quit()
+
+def test_letterbox_in_wide_window():
+    # 4:3 logical area fit into 16:9 is 1440 wide with 240px bars each side
+    assert letterbox(0.5, 0.5, 1920, 1080) == pytest.approx((0.5, 0.5))
+    assert letterbox(240 / 1920, 0.0, 1920, 1080) == pytest.approx((0.0, 0.0))
+    assert letterbox(1680 / 1920, 1.0, 1920, 1080) == pytest.approx((1.0, 1.0))
+
+def test_letterbox_in_tall_window():
+    # 1080 wide gives a 810 high area with 555px bars above and below
+    assert letterbox(0.25, 555 / 1920, 1080, 1920) == pytest.approx((0.25, 0.0))
+
+def test_map_event_rewrites_pointer_events():
+    renderer = StubRenderer()
+    event = map_event(renderer, pygame.event.Event(pygame.MOUSEMOTION, pos=(10, 20), rel=(1, 2), buttons=(0, 0, 0)))
+    assert (event.pos, event.rel) == ((20, 40), (2, 4))
+    event = map_event(renderer, pygame.event.Event(pygame.FINGERDOWN, x=0.5, y=0.25, finger_id=1, touch_id=1))
+    assert (event.x, event.y) == pytest.approx((0.5, 0.25))
+    event = map_event(renderer, pygame.event.Event(pygame.FINGERUP, x=0.125, y=1.0, finger_id=1, touch_id=1))
+    assert (event.x, event.y) == pytest.approx((0.0, 1.0))
+    key = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a)
+    assert map_event(renderer, key) is key
+
+def test_scaled_display_leaves_fingers_to_sdl(display):
+    renderer = create_renderer("software", 0.5, scaled=True)
+    event = pygame.event.Event(pygame.FINGERMOTION, x=0.1, y=0.9, finger_id=1, touch_id=1)
+    assert renderer.map_event(event) is event
+    # Mouse positions arrive in display surface coordinates
+    event = renderer.map_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(100, 50), button=1))
+    assert event.pos == (200, 100)
+    assert renderer.screen.get_size() == (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
@@ -0,0 +1,28 @@
+from tilegrid import TileGrid, WALL
+from collision import TileCollider
+from sight import LineOfSight
+
+TS = 48
+
+def sight(max_size=100):
+    grid = TileGrid(8, 5, 0)
+    grid.carve(4, 0, 1, 3, WALL)
+    return LineOfSight(TileCollider(grid.freeze(), TS), max_size)
+
+def test_visible_and_blocked():
+    los = sight()
+    assert los.tiles_visible((1, 1), (6, 1)) is False
+    assert los.tiles_visible((1, 4), (6, 4)) is True
+    assert los.visible(1.5 * TS, 1.2 * TS, 6.9 * TS, 1.1 * TS) is False
+
+def test_pairs_are_cached_both_ways():
+    los = sight()
+    los.tiles_visible((1, 1), (6, 1))
+    los.tiles_visible((6, 1), (1, 1))
+    assert los.stats() == {"size": 1, "hits": 1, "misses": 1, "hit_rate": 0.5}
+
+def test_full_cache_is_cleared():
+    los = sight(max_size=2)
+    for tx in range(3):
+        los.tiles_visible((0, 4), (tx, 3))
+    assert len(los.cache) == 1
@@ -0,0 +1,58 @@
+import pygame
+from spatial import SpatialHash, CollisionStats
+from projectiles import ProjectileSystem, OWNER_PLAYER, OWNER_ENEMY, KIND_BULLET, KIND_SIZES
+
+HALF = KIND_SIZES[KIND_BULLET] // 2
+
+class Box(pygame.sprite.Sprite):
+    def __init__(self, x, y, w=32, h=32):
+        super().__init__()
+        self.rect = pygame.Rect(x, y, w, h)
+
+def test_sprites_are_filed_under_every_cell_they_overlap():
+    spatial = SpatialHash(48)
+    box = Box(40, 50, 20, 10)
+    spatial.insert(box)
+    assert sorted(spatial.cells) == [(0, 1), (1, 1)]
+    assert spatial.query_cells([(1, 1), (0, 1), (5, 5)]) == [box]
+    spatial.remove(box)
+    assert spatial.cells == {}
+
+def test_collide_sprite_counts_pairs_and_skips_killed():
+    stats = CollisionStats()
+    spatial = SpatialHash(48, stats)
+    near, far, dead = Box(10, 10), Box(30, 30), Box(0, 0)
+    group = pygame.sprite.Group(near, far)
+    spatial.rebuild([near, far, dead])
+    player = Box(0, 0, 20, 20)
+    assert spatial.collide_sprite(player) == [near]
+    assert stats.as_dict() == {"pairs_tested": 3, "collisions_found": 1}
+    assert spatial.collide_sprite(player, dokill=True) == [near]
+    assert not group.has(near)
+    stats.reset()
+    assert stats.as_dict() == {"pairs_tested": 0, "collisions_found": 0}
+
+def test_projectile_pairs_count_every_candidate():
+    stats = CollisionStats()
+    pool = ProjectileSystem(16)
+    for x in (100, 200, 300):
+        pool.spawn(x, 100, 0, 0, 1, 10, OWNER_ENEMY, KIND_BULLET)
+    pool.spawn(100, 100, 0, 0, 1, 10, OWNER_PLAYER, KIND_BULLET)
+    player = Box(90, 90, 20, 20)
+    hits = pool.collide_sprites(pygame.sprite.Group(player), OWNER_ENEMY, stats)
+    assert hits == {player: [1.0]}
+    assert stats.as_dict() == {"pairs_tested": 3, "collisions_found": 1}
+
+def test_projectile_reaching_into_the_next_cell_by_a_fraction_hits():
+    stats = CollisionStats()
+    spatial = SpatialHash(48, stats)
+    pool = ProjectileSystem(4)
+    enemy = Box(48, 0, 32, 32)
+    spatial.rebuild(pygame.sprite.Group(enemy))
+    # The box ends at x = 48.5, half a pixel into the enemy's cell
+    pool.spawn(48.5 - HALF, 10, 0, 0, 3, 10, OWNER_PLAYER, KIND_BULLET)
+    assert pool.collide_hash(spatial, OWNER_PLAYER) == {enemy: [3.0]}
+    # Flush against the cell edge is no overlap
+    pool.spawn(48 - HALF, 10, 0, 0, 3, 10, OWNER_PLAYER, KIND_BULLET)
+    assert pool.occupied_cells(OWNER_PLAYER, 48) == {(0, 0)}
+    assert pool.collide_hash(spatial, OWNER_PLAYER) == {}
@@ -0,0 +1,33 @@
+import pygame
+import pytest
+from text_cache import TextCache
+
+@pytest.fixture
+def font():
+    pygame.font.init()
+    return pygame.font.Font(None, 20)
+
+def test_repeated_text_is_a_hit(font):
+    cache = TextCache(4)
+    first = cache.render(font, "score", (255, 255, 255))
+    assert cache.render(font, "score", [255, 255, 255]) is first
+    assert cache.render(font, "score", (255, 0, 0)) is not first
+    assert cache.stats() == {"size": 2, "max_size": 4, "hits": 1, "misses": 2, "hit_rate": 1 / 3}
+
+def test_least_recently_used_is_evicted(font):
+    cache = TextCache(2)
+    a = cache.render(font, "a", (0, 0, 0))
+    cache.render(font, "b", (0, 0, 0))
+    cache.render(font, "a", (0, 0, 0))
+    cache.render(font, "c", (0, 0, 0))
+    assert cache.render(font, "a", (0, 0, 0)) is a
+    assert cache.misses == 3
+    cache.render(font, "b", (0, 0, 0))
+    assert cache.misses == 4
+
+def test_clear_resets_entries_and_counters(font):
+    cache = TextCache(2)
+    cache.render(font, "a", (0, 0, 0))
+    cache.render(font, "a", (0, 0, 0))
+    cache.clear()
+    assert cache.stats() == {"size": 0, "max_size": 2, "hits": 0, "misses": 0, "hit_rate": 0.0}
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from tilegrid import TileGrid, FLOOR, WALL
+
+def test_carve_clips_to_map():
+    grid = TileGrid(4, 3)
+    grid.carve(-1, 1, 3, 5)
+    assert grid.cells.tolist() == [
+        [WALL, WALL, WALL, WALL],
+        [FLOOR, FLOOR, WALL, WALL],
+        [FLOOR, FLOOR, WALL, WALL],
+    ]
+
+def test_frozen_grid_rejects_writes():
+    grid = TileGrid(4, 4).freeze()
+    with pytest.raises(ValueError):
+        grid.cells[0, 0] = FLOOR
+    with pytest.raises(ValueError):
+        grid.solid[0, 0] = False
+    with pytest.raises(ValueError):
+        grid.carve(0, 0, 2, 2)
+
+def test_solid_mask_and_view_match_cells():
+    grid = TileGrid(5, 4)
+    grid.carve(1, 1, 3, 2)
+    grid.freeze()
+    assert np.array_equal(grid.solid, grid.cells == WALL)
+    assert grid.view[1, 2] == FLOOR
+    assert grid.view[0, 2] == WALL
+
+def test_is_wall_outside_map():
+    grid = TileGrid(3, 3, FLOOR).freeze()
+    assert not grid.is_wall(1, 1)
+    assert grid.is_wall(-1, 0)
+    assert grid.is_wall(0, 3)
+
+def test_floor_tiles_row_by_row():
+    grid = TileGrid(3, 3)
+    grid.carve(1, 0, 2, 1)
+    grid.carve(0, 2, 1, 1)
+    assert grid.freeze().floor_tiles() == [(1, 0), (2, 0), (0, 2)]
@@ -0,0 +1,41 @@
+from config import TILE_SIZE
+from tilegrid import TileGrid, WALL
+from tilemap import TileMap
+
+THEME = {"wall": (200, 0, 0), "floor": (0, 0, 50)}
+
+class ForgetLog:
+    # Stands in for a renderer, records the surfaces it was told to drop
+    def __init__(self):
+        self.forgotten = []
+
+    def forget(self, surface):
+        self.forgotten.append(surface)
+
+def grid_with_wall_at(tx, ty):
+    grid = TileGrid(6, 6, 0)
+    grid.carve(tx, ty, 1, 1, WALL)
+    return grid.freeze()
+
+def color_at(tilemap, tx, ty):
+    surface = tilemap.chunks[(tx // 4, ty // 4)]
+    x = (tx % 4) * TILE_SIZE + TILE_SIZE // 2
+    y = (ty % 4) * TILE_SIZE + TILE_SIZE // 2
+    return tuple(surface.get_at((x, y)))[:3]
+
+def test_chunks_show_walls_and_floor():
+    tilemap = TileMap(grid_with_wall_at(1, 5), THEME, chunk_size=4)
+    assert sorted(tilemap.chunks) == [(0, 0), (0, 1), (1, 0), (1, 1)]
+    assert tilemap.chunks[(1, 1)].get_size() == (2 * TILE_SIZE, 2 * TILE_SIZE)
+    assert color_at(tilemap, 1, 5) == THEME["wall"]
+    assert color_at(tilemap, 2, 5) == THEME["floor"]
+
+def test_recycled_chunks_are_repainted_and_forgotten():
+    renderer = ForgetLog()
+    old = TileMap(grid_with_wall_at(1, 1), THEME, chunk_size=4, renderer=renderer)
+    surfaces = dict(old.chunks)
+    new = TileMap(grid_with_wall_at(2, 1), THEME, chunk_size=4, recycle=old, renderer=renderer)
+    assert all(new.chunks[key] is surfaces[key] for key in surfaces)
+    assert set(renderer.forgotten) == set(surfaces.values())
+    assert color_at(new, 1, 1) == THEME["floor"]
+    assert color_at(new, 2, 1) == THEME["wall"]
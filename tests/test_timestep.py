@@ -0,0 +1,21 @@
+import pytest
+from timestep import FixedTimestep
+
+def test_steps_follow_elapsed_time():
+    timestep = FixedTimestep(rate=10, max_steps=5)
+    assert timestep.advance(1.0) == 0
+    assert timestep.advance(1.05) == 0
+    assert timestep.alpha() == pytest.approx(0.5)
+    assert timestep.advance(1.25) == 2
+    assert timestep.alpha() == pytest.approx(0.5)
+    assert timestep.stats() == {"dropped_steps": 0}
+
+def test_long_stall_drops_the_backlog():
+    timestep = FixedTimestep(rate=10, max_steps=3)
+    timestep.advance(0.0)
+    assert timestep.advance(1.05) == 3
+    assert timestep.dropped_steps == 7
+    # Only the fraction of a step is carried over
+    assert timestep.alpha() == pytest.approx(0.5)
+    assert timestep.advance(1.1) == 1
+    assert timestep.stats() == {"dropped_steps": 7}
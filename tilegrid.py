@@ -0,0 +1,45 @@
+import numpy as np
+from config import *
+
+FLOOR = 0
+WALL = 1
+
+class TileGrid:
+    """
+    Level tiles as one (height, width) uint8 NumPy array, FLOOR or WALL.
+    The generator carves whole rectangles at once and then freezes the
+    grid. From then on it is read-only, and collision, pathfinding and the
+    tile map all read the same memory:
+
+        cells         the uint8 array, cells[ty, tx]
+        solid         bool array, True on walls
+        view          memoryview of cells for fast scalar reads, view[ty, tx]
+        is_wall(x, y) with everything outside the map counting as wall
+    """
+    def __init__(self, width, height, fill=WALL):
+        self.width = width
+        self.height = height
+        self.cells = np.full((height, width), fill, dtype=np.uint8)
+        self.solid = None
+        self.view = None
+
+    def carve(self, x, y, w, h, value=FLOOR):
+        # Sets the w x h tiles from (x, y), clipped to the map
+        self.cells[max(0, y):y + h, max(0, x):x + w] = value
+
+    def freeze(self):
+        self.cells.flags.writeable = False
+        self.solid = self.cells == WALL
+        self.solid.flags.writeable = False
+        self.view = memoryview(self.cells)
+        return self
+
+    def is_wall(self, tx, ty):
+        if tx < 0 or ty < 0 or tx >= self.width or ty >= self.height:
+            return True
+        return self.view[ty, tx] == WALL
+
+    def floor_tiles(self):
+        # [(tx, ty), ...] of every floor tile, row by row
+        ys, xs = np.nonzero(self.cells == FLOOR)
+        return list(zip(xs.tolist(), ys.tolist()))
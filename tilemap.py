@@ -0,0 +1,71 @@
+import pygame
+import numpy as np
+from config import *
+
+class TileMap:
+    """
+    Static level geometry rasterized once into square chunk surfaces.
+    Only the chunks overlapping the camera view are blitted each frame.
+    Passing the previous level's TileMap as recycle repaints its chunk
+    surfaces instead of allocating new ones; renderer is then told to drop
+    whatever it cached for them.
+    """
+    def __init__(self, grid, theme, chunk_size=TILEMAP_CHUNK_SIZE, recycle=None, renderer=None):
+        self.grid = grid # Frozen TileGrid
+        self.height = grid.height
+        self.width = grid.width
+        self.wall_color = theme["wall"]
+        self.floor_color = theme["floor"]
+        self.chunk_size = chunk_size
+        self.chunk_px = chunk_size * TILE_SIZE
+        self.chunks_x = (self.width + chunk_size - 1) // chunk_size
+        self.chunks_y = (self.height + chunk_size - 1) // chunk_size
+        self.chunks = {} # (cx, cy) -> Surface
+        self.renderer = renderer
+        self.build(recycle.chunks if recycle else {})
+
+    def build(self, spare):
+        chunks = {}
+        for cy in range(self.chunks_y):
+            for cx in range(self.chunks_x):
+                chunks[(cx, cy)] = self.render_chunk(cx, cy, spare.get((cx, cy)))
+        self.chunks = chunks
+
+    def render_chunk(self, cx, cy, surface=None):
+        x0 = cx * self.chunk_size
+        y0 = cy * self.chunk_size
+        w = min(self.chunk_size, self.width - x0)
+        h = min(self.chunk_size, self.height - y0)
+
+        # Plain surfaces already match the display format, no convert() needed
+        size = (w * TILE_SIZE, h * TILE_SIZE)
+        if surface is None or surface.get_size() != size:
+            surface = pygame.Surface(size)
+        elif self.renderer is not None:
+            # Its texture / scaled copy shows the previous level
+            self.renderer.forget(surface)
+        surface.fill(self.floor_color)
+        # One fill per horizontal run of wall tiles
+        edges = np.zeros((h, w + 2), dtype=np.int8)
+        edges[:, 1:-1] = self.grid.cells[y0:y0 + h, x0:x0 + w]
+        edges = np.diff(edges, axis=1)
+        starts_y, starts_x = np.nonzero(edges == 1)
+        ends_x = np.nonzero(edges == -1)[1]
+        for y, x, end in zip(starts_y.tolist(), starts_x.tolist(), ends_x.tolist()):
+            surface.fill(self.wall_color, (x * TILE_SIZE, y * TILE_SIZE, (end - x) * TILE_SIZE, TILE_SIZE))
+        return surface
+
+    def visible_chunks(self, view):
+        # Chunk index range overlapping a world-space rect
+        first_cx = max(0, view.left // self.chunk_px)
+        first_cy = max(0, view.top // self.chunk_px)
+        last_cx = min(self.chunks_x - 1, (view.right - 1) // self.chunk_px)
+        last_cy = min(self.chunks_y - 1, (view.bottom - 1) // self.chunk_px)
+        for cy in range(first_cy, last_cy + 1):
+            for cx in range(first_cx, last_cx + 1):
+                yield cx, cy
+
+    def queue(self, pipeline, camera):
+        ox, oy = camera.draw_offset
+        for cx, cy in self.visible_chunks(camera.view_rect()):
+            pipeline.add(LAYER_FLOOR, self.chunks[(cx, cy)], (cx * self.chunk_px + ox, cy * self.chunk_px + oy))
@@ -0,0 +1,37 @@
+from config import *
+
+class FixedTimestep:
+    """
+    Accumulates real frame time and says how many fixed simulation steps
+    to run, so the game runs at SIM_RATE whatever the render rate. Timers
+    in config that count "frames" count these steps. After a long stall
+    at most max_steps are run and the rest of the backlog is dropped, so a
+    slow device can't fall further and further behind.
+    """
+    def __init__(self, rate=SIM_RATE, max_steps=MAX_CATCH_UP_STEPS):
+        self.dt = 1.0 / rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.last = None
+        self.dropped_steps = 0
+
+    def advance(self, now):
+        # now is a monotonic time in seconds, e.g. time.perf_counter()
+        if self.last is None:
+            self.last = now
+        self.accumulator += now - self.last
+        self.last = now
+        steps = int(self.accumulator / self.dt)
+        if steps > self.max_steps:
+            self.dropped_steps += steps - self.max_steps
+            steps = self.max_steps
+            self.accumulator = self.accumulator % self.dt + steps * self.dt
+        self.accumulator -= steps * self.dt
+        return steps
+
+    def stats(self):
+        return {"dropped_steps": self.dropped_steps}
+
+    def alpha(self):
+        # How far the render time is between the last two simulated states
+        return min(self.accumulator / self.dt, 1.0)
@@ -1,6 +1,7 @@
 import pygame
 import math
 from config import *
+import text_cache
 
 class VirtualJoystick:
     def __init__(self, x, y, radius, inner_radius=None):
@@ -14,6 +15,11 @@ class VirtualJoystick:
         self.value = (0, 0) # (x, y) normalized -1 to 1
         self.touch_id = None # To track multi-touch
 
+        # Pre-rendered layers, built on first draw
+        self.base_image = None
+        self.idle_image = None
+        self.knob_image = None
+
     def handle_event(self, event):
         if event.type == pygame.FINGERDOWN:
             x = event.x * SCREEN_WIDTH
@@ -83,16 +89,32 @@ class VirtualJoystick:
         self.value = (0, 0)
         self.touch_id = None
 
+    def build_images(self):
+        # Base (Semi-transparent)
+        self.base_image = pygame.Surface((self.radius*2, self.radius*2), pygame.SRCALPHA)
+        pygame.draw.circle(self.base_image, (200, 200, 200, 50), (self.radius, self.radius), self.radius)
+        pygame.draw.circle(self.base_image, (255, 255, 255, 100), (self.radius, self.radius), self.radius, 2)
+        
+        # Knob
+        self.knob_image = pygame.Surface((self.inner_radius*2, self.inner_radius*2), pygame.SRCALPHA)
+        pygame.draw.circle(self.knob_image, (255, 255, 255, 150), (self.inner_radius, self.inner_radius), self.inner_radius)
+        
+        # Idle: knob resting in the center, a single blit
+        self.idle_image = self.base_image.copy()
+        self.idle_image.blit(self.knob_image, (self.radius - self.inner_radius, self.radius - self.inner_radius))
+
     def draw(self, screen):
-        # Draw Base (Semi-transparent)
-        s = pygame.Surface((self.radius*2, self.radius*2), pygame.SRCALPHA)
-        pygame.draw.circle(s, (200, 200, 200, 50), (self.radius, self.radius), self.radius)
-        pygame.draw.circle(s, (255, 255, 255, 100), (self.radius, self.radius), self.radius, 2)
-        screen.blit(s, (self.center[0] - self.radius, self.center[1] - self.radius))
+        if self.base_image is None:
+            self.build_images()
+        
+        base_pos = (self.center[0] - self.radius, self.center[1] - self.radius)
+        if not self.active:
+            screen.blit(self.idle_image, base_pos)
+            return
         
-        # Draw Knob
-        knob_pos = (int(self.touch_pos[0]), int(self.touch_pos[1]))
-        pygame.draw.circle(screen, (255, 255, 255, 150), knob_pos, self.inner_radius)
+        screen.blit(self.base_image, base_pos)
+        knob_pos = (int(self.touch_pos[0]) - self.inner_radius, int(self.touch_pos[1]) - self.inner_radius)
+        screen.blit(self.knob_image, knob_pos)
 
 
 class TouchButton:
@@ -105,6 +127,10 @@ class TouchButton:
         self.pressed = False
         self.touch_id = None
 
+        # Pre-rendered (normal, pressed) images and the font they were built with
+        self.images = None
+        self.images_font = None
+
     def handle_event(self, event):
         if event.type == pygame.FINGERDOWN:
             x = event.x * SCREEN_WIDTH
@@ -140,15 +166,26 @@ class TouchButton:
                 
         return False
 
-    def draw(self, screen, font):
-        color = self.color if not self.pressed else (min(255, self.color[0]+50), min(255, self.color[1]+50), min(255, self.color[2]+50))
+    def render_image(self, color, font):
+        size = self.radius * 2
+        center = (self.radius, self.radius)
+        surface = pygame.Surface((size, size), pygame.SRCALPHA)
         
         # Base
-        pygame.draw.circle(screen, color, self.center, self.radius)
-        pygame.draw.circle(screen, WHITE, self.center, self.radius, 2)
+        pygame.draw.circle(surface, color, center, self.radius)
+        pygame.draw.circle(surface, WHITE, center, self.radius, 2)
         
         # Label
         if self.label:
-            text_surf = font.render(self.label, True, WHITE)
-            text_rect = text_surf.get_rect(center=self.center)
-            screen.blit(text_surf, text_rect)
+            text_surf = text_cache.render(font, self.label, WHITE)
+            text_rect = text_surf.get_rect(center=center)
+            surface.blit(text_surf, text_rect)
+        return surface
+
+    def draw(self, screen, font):
+        if self.images is None or self.images_font is not font:
+            pressed_color = (min(255, self.color[0]+50), min(255, self.color[1]+50), min(255, self.color[2]+50))
+            self.images = (self.render_image(self.color, font), self.render_image(pressed_color, font))
+            self.images_font = font
+        
+        screen.blit(self.images[self.pressed], (self.center[0] - self.radius, self.center[1] - self.radius))